@@ -50,7 +50,7 @@ class BackupManager(ABC):
         Логирует все этапы работы и обрабатывает возможные ошибки.
         """
 
-        start_time = time.time()
+        start_time = time.perf_counter()
         remote_path = None
 
         self._create_temp_logging()
@@ -79,7 +79,7 @@ class BackupManager(ABC):
         else:
             self._completion(remote_path=remote_path, e=None)
         finally:
-            executed_time = time.time() - start_time
+            executed_time = time.perf_counter() - start_time
             logger.info(T.time_run.format(time=f"{executed_time:.2f}"))
 
     def _main_program_loop(self) -> str | None:
@@ -1,4 +1,5 @@
 import dotenv
+from functools import lru_cache
 from pathlib import Path
 import os
 import logging
@@ -20,6 +21,8 @@ class EnvironmentVariables:
     """
     Класс для работы с переменными окружения и хранилищем keyring.
     Поддерживает загрузку из .env, чтение/запись через keyring и валидацию обязательных переменных.
+
+    Значения из keyring не кешируются: каждое чтение видит изменения, сделанные извне.
     """
 
     def __init__(self):
@@ -121,6 +124,18 @@ class EnvironmentVariables:
         raise RuntimeError(T.missing_mandatory_variables)
 
 
+@lru_cache(maxsize=1)
+def env() -> EnvironmentVariables:
+    """
+    Общий на процесс экземпляр EnvironmentVariables.
+    .env читается один раз, а не при каждом создании TokenManager/OAuthFlow.
+    Как и сам класс, не потокобезопасен при одновременной записи в keyring.
+
+    :return: Экземпляр EnvironmentVariables
+    """
+    return EnvironmentVariables()
+
+
 if __name__ == "__main__":
     # Если файл запускается как скрипт, то инициализируется класс и запускается ввод переменных
     parent_dir = Path.cwd().parent.parent
@@ -1,5 +1,5 @@
 from __future__ import annotations
-import re
+from functools import lru_cache
 from typing import Protocol
 from datetime import date
 import logging
@@ -47,7 +47,7 @@ class RemoteArchiveNaming(RemoteArchiveNamingProtokol):
         archive_ext (str): Расширение архивного файла
         root_remote_archive_dir (str): Корневая директория архива на облачном диске
         full_remote_archive_dir (str): Полный путь к директории на удалённом диске
-        file_nums (list[int]): Список извлечённых номеров файлов за выбранную дату
+        max_file_num (int): Наибольший номер файла за выбранную дату (0 - файлов нет)
         archive_name_format (str): Формат имени архива.
 
     Пример использования находится в файле:
@@ -67,18 +67,27 @@ class RemoteArchiveNaming(RemoteArchiveNamingProtokol):
             C.ENV_ROOT_REMOTE_ARCHIVE_DIR, C.ROOT_REMOTE_ARCHIVE_DIR
         )  # Головной каталог архивов на облачном диске
         self.full_remote_archive_dir = ""
-        self.file_nums: list[int] = []
-        self.archive_name_format = self._get_archive_name_format()
+        self.max_file_num: int = 0
+        # Формат, префикс и расширение имён архивов за дату — строятся один раз на процесс,
+        # а не для каждого экземпляра и каждого элемента директории
+        (
+            self.archive_name_format,
+            self._archive_prefix_lower,
+            self._archive_ext_lower,
+        ) = _archive_name_parts(
+            self.remote_archive_prefix, self.archive_ext, self.target_date
+        )
 
     def _create_remote_name(self) -> str:
         """
         Генерирует уникальное имя архива на основе существующих файлов
         :return: (str) - Имя архива, сгенерированное по шаблону.
         """
-        logger.debug(T.file_numbers_found.format(file_nums=self.file_nums))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(T.file_numbers_found.format(max_file_num=self.max_file_num))
         logger.info(T.archive_name_generation)
         # Вычисляем следующий порядковый номер архива на заданную дату
-        next_num: int = max(self.file_nums, default=0) + 1
+        next_num: int = self.max_file_num + 1
 
         # Формируем имя файла архива в соответствии с шаблоном
         return f"{self.archive_name_format.format(file_num=next_num)}{self.archive_ext}"
@@ -87,7 +96,7 @@ class RemoteArchiveNaming(RemoteArchiveNamingProtokol):
         """
         CALLBACK
 
-        Получает очередное имя файла из каталога и формирует список имён файлов, прошедших фильтрацию
+        Получает очередное имя файла из каталога и обновляет наибольший номер архива за дату
         :param item: (str) Имя очередного файла
         :return: None
         """
@@ -96,64 +105,36 @@ class RemoteArchiveNaming(RemoteArchiveNamingProtokol):
             return
 
         # Извлекаем номер файла из имени файла
-        file_num_str = self._extract_file_num(item)
+        file_num = self._extract_file_num(item)
 
         # Пропускаем если не удалось извлечь
-        if file_num_str is None:
+        if file_num is None:
             return
 
-        # Преобразуем в число и сохраняем
-        self.file_nums.append(int(file_num_str))
+        # Список номеров не храним — нужен только максимум
+        if file_num > self.max_file_num:
+            self.max_file_num = file_num
         return
 
-    def _get_archive_name_format(self) -> str:
-        """
-            Возвращает формат имени архива
-            созданный как конкретизация основного формата заданной датой и префиксом архива.
-        :return: (str) - Конкретизированный формат имени архива.
-        """
-        return C.GENERAL_REMOTE_ARCHIVE_FORMAT.format(
-            archive=self.remote_archive_prefix,
-            year=str(self.target_date.year),
-            month=f"{self.target_date.month:02d}",
-            day=f"{self.target_date.day:02d}",
-            file_num="{file_num}",  # Заполнитель для номера
-        )
-
     def _extract_file_num(self, filename: str) -> int | None:
         """
-        Извлекает номер файла из имени файла с помощью регулярного выражения
+        Извлекает номер файла из имени файла вида <префикс за дату><номер><расширение>.
+        Сравнение без учёта регистра; вместо регулярного выражения — проверка префикса
+        и суффикса, имя каждого элемента директории приводится к нижнему регистру один раз.
 
         :param: filename: (str) - имя файла
         Returns:
             int: номер файла
             None: если имя не соответствует шаблону
         """
-        re_archive_name = self._get_archive_pattern_for_date()
-        if match := re.match(re_archive_name, filename):
-            return int(match.group("file_num"))
-        return None
-
-    def _get_archive_pattern_for_date(self) -> re.Pattern:
-        """
-        Генерирует регулярное выражение для поиска файлов текущего формата
-        с учетом даты и префикса
-        :return: re. Pattern Сгенерированное регулярное выражение
-        """
-        # Формируем фиксированный префикс из общего формата
-        prefix = self.archive_name_format.format(
-            file_num="",  # Убираем часть с номером файла
-        )
-        # Экранируем спецсимволы для regex
-        escaped_prefix = re.escape(prefix)
-        escaped_ext = re.escape(self.archive_ext)
-
-        # Собираем полное регулярное выражение
-        return re.compile(
-            rf"^{escaped_prefix}(?P<file_num>\d+){escaped_ext}$",
-            # (?P<file_num>\d+) - группа file_num для номера файла за дату
-            re.IGNORECASE,  # Независимый от регистра поиск
-        )
+        name = filename.lower()
+        prefix, ext = self._archive_prefix_lower, self._archive_ext_lower
+        if not (name.startswith(prefix) and name.endswith(ext)):
+            return None
+        file_num = name[len(prefix) : len(name) - len(ext)]
+        if not file_num.isdecimal():
+            return None
+        return int(file_num)
 
     def generate_path_remote_dir(self) -> str:
         """
@@ -183,6 +164,30 @@ class RemoteArchiveNaming(RemoteArchiveNamingProtokol):
         :return: str - сгенерированный путь на файл
         """
         remote_path = f"{self.full_remote_archive_dir}/{self._create_remote_name()}"
-        logger.debug(T.path_to_cloud.format(remote_path=remote_path))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(T.path_to_cloud.format(remote_path=remote_path))
 
         return remote_path
+
+
+@lru_cache(maxsize=32)
+def _archive_name_parts(
+    prefix: str, ext: str, target_date: date
+) -> tuple[str, str, str]:
+    """
+    Возвращает формат имени архива, созданный как конкретизация основного формата
+    заданной датой и префиксом архива, а также префикс имени за дату и расширение
+    в нижнем регистре (для сравнения без учёта регистра).
+    :param prefix: (str) - Префикс имени файла архива
+    :param ext: (str) - Расширение файла архива
+    :param target_date: (date) - Дата для наименования файла архива
+    :return: (tuple[str, str, str]) - Формат имени, префикс за дату, расширение
+    """
+    name_format = C.GENERAL_REMOTE_ARCHIVE_FORMAT.format(
+        archive=prefix,
+        year=str(target_date.year),
+        month=f"{target_date.month:02d}",
+        day=f"{target_date.day:02d}",
+        file_num="{file_num}",  # Заполнитель для номера
+    )
+    return name_format, name_format.format(file_num="").lower(), ext.lower()
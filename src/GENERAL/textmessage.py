@@ -48,7 +48,7 @@ class TextMessage(frozenset):
     error_unknown = "Неизвестная ошибка"
     exists_list_file = "Файл списка файлов архивации существует: {list_file_path}"
     failed_send_email = "Все попытки отправки email провалились"
-    file_numbers_found = "Найдены номера файлов: {file_nums}"
+    file_numbers_found = "Наибольший найденный номер файла: {max_file_num}"
     getting_file_numbers = "Получение номеров файлов из {archive}"
     init_arch = "Начало архивации"
     init_SearchProgramme = "Поиск архиватора"
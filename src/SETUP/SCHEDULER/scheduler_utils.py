@@ -8,7 +8,7 @@
 Все функции ориентированы на использование в SchedulePanel и связанных контроллерах.
 """
 
-import html
+from functools import lru_cache
 from typing import Any, Callable
 
 from PyQt6.QtWidgets import (
@@ -30,6 +30,14 @@ NULL_CHAR = "\x00"
 HTML_TEG = "[html]"
 DAYS_IN_WEEK = 7
 WEEKDAY_MAX_INDEX = DAYS_IN_WEEK - 1
+WEEKDAY_MASK_ALL = (1 << DAYS_IN_WEEK) - 1
+PARSE_CACHE_SIZE = 256
+
+# Состояния чекбоксов для каждой из 128 возможных масок (первый элемент — bit6)
+_MASK_TABLE: tuple[tuple[bool, ...], ...] = tuple(
+    tuple(bool(m & 1 << (WEEKDAY_MAX_INDEX - i)) for i in range(DAYS_IN_WEEK))
+    for m in range(WEEKDAY_MASK_ALL + 1)
+)
 
 WidgetHandler = Callable[[Any, str], str | None]
 
@@ -69,7 +77,8 @@ def process_weekdays_layout(layout: QLayout, text: str) -> str | None:
         except ValueError:
             return f"Некорректная битовая маска дней: {text!r}"
 
-    for bit_index in range(layout.count()):
+    states = _MASK_TABLE[mask & WEEKDAY_MASK_ALL]
+    for bit_index, checked in zip(range(layout.count()), states):
         item = layout.itemAt(bit_index)
         if item is None:
             continue
@@ -79,44 +88,11 @@ def process_weekdays_layout(layout: QLayout, text: str) -> str | None:
             continue
 
         if hasattr(w, "setChecked"):
-            checked = bool(mask & 1 << (WEEKDAY_MAX_INDEX - bit_index))
             w.setChecked(checked)
 
     return None
 
 
-def set_widget_value(
-    widget: QWidget | QLayout, text: str, *, empty: str = ""
-) -> str | None:
-    """
-    Универсальная установка значения для разных типов виджетов.
-
-    Поддерживаются:
-      - QLabel (текст метки);
-      - QTextEdit (plain/html в зависимости от префикса [html]);
-      - QPlainTextEdit;
-      - QSpinBox (целые числа);
-      - QTimeEdit (время формата HH:MM);
-      - QLayout с чекбоксами дней недели (битовая маска).
-
-    Returns:
-      None при успехе или строку с текстом ошибки при проблеме.
-    """
-    value = text or empty
-
-    # 1. Специальный случай — layout с днями недели (битовая маска)
-    if isinstance(widget, QLayout):
-        return process_weekdays_layout(widget, value)
-
-    # 2. Диспетчеризация по типу виджета
-    for cls, handler in WIDGET_HANDLERS:
-        if isinstance(widget, cls):
-            return handler(widget, value)
-
-    # 3. Тип нами не поддерживается
-    return f"Тип widget {type(widget).__name__} программой не поддерживается"
-
-
 def connect_checkboxes_in_layout(layout: QHBoxLayout, slot: Callable) -> None:
     """
     Подключает один слот ко всем чекбоксам внутри QHBoxLayout.
@@ -136,12 +112,39 @@ def connect_checkboxes_in_layout(layout: QHBoxLayout, slot: Callable) -> None:
                 w.stateChanged.connect(slot)
 
 
+def _html_prefix(css_color: str, font_weight: str) -> str:
+    """Начало HTML-фрагмента make_html() для заданного цвета и насыщенности шрифта."""
+    return (
+        f"{HTML_TEG}"
+        f'<div style="text-align:center;">'
+        f'<span style="color:{css_color}; font-weight:{font_weight};">'
+    )
+
+
+_HTML_SUFFIX = "</span></div><br>"
+# Таблица замен: то же, что html.escape(quote=True), плюс \n → <br>
+_HTML_TABLE = str.maketrans(
+    {
+        "&": "&amp;",
+        "<": "&lt;",
+        ">": "&gt;",
+        '"': "&quot;",
+        "'": "&#x27;",
+        "\n": "<br>",
+    }
+)
+_HTML_PREFIXES = {
+    "green": _html_prefix("#2e7d32", "500"),  # успех
+    "red": _html_prefix("#c62828", "600"),  # ошибка
+}
+
+
 def make_html(text: str, color: str) -> str:
     """
     Формирует небольшой HTML-фрагмент для вывода в QTextEdit.
 
     Особенности:
-      - text экранируется (html.escape) и переводы строк \n заменяются на <br>;
+      - text экранируется (как html.escape) и переводы строк \n заменяются на <br>;
       - параметр color задаёт цвет текста (например, 'green'/'red' или любой CSS-цвет);
       - насыщенность шрифта подбирается автоматически:
           * "green" — успешное сообщение (слегка жирный);
@@ -151,30 +154,15 @@ def make_html(text: str, color: str) -> str:
     Возвращаемая строка дополнительно помечается префиксом [html], чтобы
     её можно было корректно обработать в handle_text_edit().
     """
-    # Экранируем спецсимволы и переводим \n в <br>
-    safe_text = html.escape(text).replace("\n", "<br>")
-
-    # Подбираем цвет и насыщенность шрифта
-    if color == "green":  # успех
-        css_color = "#2e7d32"
-        font_weight = "500"
-    elif color == "red":  # ошибка
-        css_color = "#c62828"
-        font_weight = "600"
-    else:  # информационные сообщения
-        css_color = color
-        font_weight = "400"
+    # Экранируем спецсимволы и переводим \n в <br> за один проход
+    safe_text = text.translate(_HTML_TABLE)
 
-    return (
-        f"{HTML_TEG}"
-        f'<div style="text-align:center;">'
-        f'<span style="color:{css_color}; font-weight:{font_weight};">'
-        f"{safe_text}"
-        f"</span>"
-        f"</div><br>"
-    )
+    # Для известных цветов префикс подготовлен заранее
+    prefix = _HTML_PREFIXES.get(color) or _html_prefix(color, "400")
+    return prefix + safe_text + _HTML_SUFFIX
 
 
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
 def parse_int(value: str) -> int | None:
     try:
         return int(value)
@@ -182,17 +170,26 @@ def parse_int(value: str) -> int | None:
         return None
 
 
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_time_hhmm_cached(value: str) -> QTime | None:
+    q_time = QTime.fromString(value, "HH:mm")
+    if q_time.isValid():
+        return q_time
+    return None
+
+
 def parse_time_hhmm(value: str) -> QTime | None:
     """
     Преобразует строку "HH:MM" в QTime.
 
+    Результаты разбора кешируются; вызывающему возвращается копия,
+    чтобы изменения объекта не затронули кеш.
+
     Returns:
         Объект QTime при корректной строке или None при ошибке формата.
     """
-    q_time = QTime.fromString(value, "HH:mm")
-    if q_time.isValid():
-        return q_time
-    return None
+    q_time = _parse_time_hhmm_cached(value)
+    return None if q_time is None else QTime(q_time)
 
 
 def handle_label(widget: QLabel, value: str) -> str | None:
@@ -237,14 +234,53 @@ def handle_time_edit(widget: QTimeEdit, value: str) -> str | None:
     return None
 
 
-WIDGET_HANDLERS: list[tuple[type, WidgetHandler]] = [
+WIDGET_HANDLERS: tuple[tuple[type, WidgetHandler], ...] = (
     (QLabel, handle_label),
     (QTextEdit, handle_text_edit),
     (QPlainTextEdit, handle_plain_text),
     (QSpinBox, handle_spinbox),
     (QTimeEdit, handle_time_edit),
     (QLineEdit, handle_text_edit),
-]
+)
+
+
+def set_widget_value(
+    widget: QWidget | QLayout,
+    text: str,
+    *,
+    empty: str = "",
+    _handlers: tuple[tuple[type, WidgetHandler], ...] = WIDGET_HANDLERS,
+) -> str | None:
+    """
+    Универсальная установка значения для разных типов виджетов.
+
+    Поддерживаются:
+      - QLabel (текст метки);
+      - QTextEdit (plain/html в зависимости от префикса [html]);
+      - QPlainTextEdit;
+      - QSpinBox (целые числа);
+      - QTimeEdit (время формата HH:MM);
+      - QLayout с чекбоксами дней недели (битовая маска).
+
+    _handlers — таблица WIDGET_HANDLERS, связанная при определении функции
+    (быстрый доступ как к локальной переменной); передавать её не нужно.
+
+    Returns:
+      None при успехе или строку с текстом ошибки при проблеме.
+    """
+    value = text or empty
+
+    # 1. Специальный случай — layout с днями недели (битовая маска)
+    if isinstance(widget, QLayout):
+        return process_weekdays_layout(widget, value)
+
+    # 2. Диспетчеризация по типу виджета
+    for cls, handler in _handlers:
+        if isinstance(widget, cls):
+            return handler(widget, value)
+
+    # 3. Тип нами не поддерживается
+    return f"Тип widget {type(widget).__name__} программой не поддерживается"
 
 
 def text_to_save_text(text: str) -> str:
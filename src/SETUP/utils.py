@@ -3,20 +3,21 @@
 
 Содержит:
 - функции сохранения/загрузки множества путей в файлы с обработкой ошибок;
-- утилиты для отображения сообщений об ошибках пользователю (QMessageBox);
-- вспомогательные парсеры и обработчики виджетов PyQt6;
-- универсальную функцию set_widget_value для установки значений в разные типы виджетов;
-- генератор небольшого HTML-фрагмента для вывода цветного текста в QTextEdit.
+- утилиты для отображения сообщений об ошибках пользователю (QMessageBox,
+  импортируется лениво — сохранение/загрузка путей не тянут Qt-виджеты);
+- настройку логирования окна настройки.
+
+Парсеры, обработчики виджетов PyQt6, set_widget_value и make_html находятся
+в src.SETUP.SCHEDULER.scheduler_utils — здесь они не дублируются.
 """
 
+import os
+from itertools import islice
 from pathlib import Path
-from typing import Sequence
+from typing import Iterable
 from enum import Enum, IntFlag, auto
 from loguru import logger
 
-from PyQt6.QtWidgets import QMessageBox
-
-
 from src.GENERAL.environment_variables import EnvironmentVariables
 from src.GENERAL.constants import Constants as C
 
@@ -39,6 +40,7 @@ ERROR_TEXT = (
 INIT_DELAY_MS = 100
 COL0_WIDTH = 320
 MAX_OUTPUT_DELETED = 10
+MAX_ERROR_DETAIL_LEN = 256
 
 
 class UserAbort(Exception):
@@ -62,18 +64,24 @@ class ResultErrorMessage(Enum):  # Флаги return code программы о
     NO = auto()  # Пользователь ответил "Нет"
 
 
-def save_set_to_file(items: set[str], list_archive_file_paths: str | Path) -> None:
+def save_set_to_file(items: Iterable[str], list_archive_file_paths: str | Path) -> None:
     """Сохраняет множество путей в файл.
 
-    Порядок в файле детерминирован (предварительная сортировка).
+    Порядок в файле детерминирован (предварительная сортировка),
+    повторяющиеся пути записываются один раз.
 
     Args:
-        items: Множество полных путей отмеченных элементов
+        items: Множество (или другая коллекция) полных путей отмеченных элементов
         list_archive_file_paths: Путь к файлу со списком архивируемых файлов.
     """
-    p = Path(list_archive_file_paths)
+    p = os.fspath(list_archive_file_paths)  # без лишнего разбора в Path
+    # Содержимое строится до открытия файла: ошибка в items не затрёт сохранённые отметки
+    unique = items if isinstance(items, (set, frozenset)) else set(items)
+    data = "\n".join(sorted(unique))
     try:
-        p.parent.mkdir(parents=True, exist_ok=True)
+        parent = os.path.dirname(p)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
     except PermissionError as e:
         handle_error_message(3, p, e)
         return
@@ -82,7 +90,8 @@ def save_set_to_file(items: set[str], list_archive_file_paths: str | Path) -> No
         return
 
     try:
-        p.write_text("\n".join(sorted(items)), encoding="utf-8")
+        with open(p, "w", encoding="utf-8") as f:
+            f.write(data)
     except PermissionError as e:
         handle_error_message(3, p, e)
     except OSError as e:
@@ -103,9 +112,9 @@ def load_from_file(
 
     """
     try:
-        p = Path(list_archive_file_paths)
-        nodes = p.read_text(encoding="utf-8").splitlines()
-        existing, deleted = filter_existing(nodes)
+        # Файл читается построчно, без промежуточного списка всех строк
+        with open(list_archive_file_paths, "r", encoding="utf-8") as f:
+            existing, deleted = filter_existing(line.rstrip("\n") for line in f)
     except PermissionError as e:
         handle_error_message(
             2, list_archive_file_paths, e, flags=FlagMessageError.CONFIRM
@@ -123,7 +132,7 @@ def load_from_file(
     if deleted:
         deleted_out = deleted
         if MAX_OUTPUT_DELETED < len(deleted):
-            deleted_out = deleted[: MAX_OUTPUT_DELETED - 1]
+            deleted_out = list(islice(deleted, MAX_OUTPUT_DELETED - 1))
             deleted_out.append("...")
 
         ret_code = handle_error_message(
@@ -137,13 +146,13 @@ def load_from_file(
     return existing, deleted
 
 
-def filter_existing(nodes: Sequence[str]) -> tuple[list[str], list[str]]:
+def filter_existing(nodes: Iterable[str]) -> tuple[list[str], list[str]]:
     """
     Фильтрует список путей.
     Делит пути на существующие и не существующие.
 
     Args:
-        nodes: последовательность путей (str).
+        nodes: итерируемая последовательность путей (str).
 
     Returns:
         (existing, deleted):
@@ -165,12 +174,21 @@ def filter_existing(nodes: Sequence[str]) -> tuple[list[str], list[str]]:
 def _format_error_msg(
     template: str, p: Path | str | None, e: Exception | None, *, full: bool
 ) -> str:
-    """Форматирует текст: с деталями при full=True, без них при full=False."""
-    return template.format(p=p or "", e=str(e) if (e and full) else "")
+    """Форматирует текст: с деталями при full=True, без них при full=False.
+
+    Длина деталей ограничена MAX_ERROR_DETAIL_LEN; для OSError имя файла сохраняется.
+    """
+    p_str = "" if p is None else str(p)
+    e_str = ""
+    if e is not None and full:
+        e_str = str(e)[:MAX_ERROR_DETAIL_LEN]
+    return template.format(p=p_str, e=e_str)
 
 
 def _ask_confirm(msg: str) -> bool:
     """Yes/No. True — продолжить."""
+    from PyQt6.QtWidgets import QMessageBox  # Qt-виджеты нужны только для диалога
+
     btn = QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
     r = QMessageBox.question(
         None, "Подтверждение", msg, btn, QMessageBox.StandardButton.No
@@ -198,8 +216,10 @@ def handle_error_message(
     """
     template = ERROR_TEXT[error_number]
 
-    # 1) Подробный лог (с e)
-    logger.error(_format_error_msg(template, p, e, full=True))
+    # 1) Подробный лог (с e). Текст строится, только если уровень ERROR не отфильтрован
+    logger.opt(lazy=True).error(
+        "{}", lambda: _format_error_msg(template, p, e, full=True)
+    )
 
     # 2) Краткое сообщение пользователю (без e)
     msg = _format_error_msg(template, p, e, full=False)
@@ -241,6 +261,8 @@ def handle_error(msg: str, flags: FlagMessageError) -> ResultErrorMessage:
             raise UserAbort
 
     elif flags & FlagMessageError.UNCONFIRM:
+        from PyQt6.QtWidgets import QMessageBox
+
         QMessageBox.warning(None, "Предупреждение", msg)
         return ResultErrorMessage.NO
 
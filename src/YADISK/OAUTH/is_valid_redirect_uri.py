@@ -1,9 +1,11 @@
+from functools import lru_cache
 from urllib.parse import urlparse
 import re
 
 from src.YADISK.yandextextmessage import YandexTextMessage as YT
 
 
+@lru_cache(maxsize=8)
 def is_valid_redirect_uri(uri: str) -> bool:
     """Проверяет валидность redirect URI согласно спецификации OAuth 2.0 и требованиям Яндекс.
 
@@ -11,22 +11,21 @@
 """
 
 from __future__ import annotations
-import webbrowser
 from http.server import HTTPServer, BaseHTTPRequestHandler
 import time
 import threading
 import requests
-from urllib.parse import urlparse, parse_qs
+from urllib.parse import urlparse, parse_qsl
+from functools import lru_cache
 from typing import Any, cast
 import logging
 
-from oauthlib.oauth2 import WebApplicationClient
-
-from src.GENERAL.environment_variables import EnvironmentVariables
+from src.GENERAL.environment_variables import EnvironmentVariables, env
 from src.YADISK.OAUTH.exceptions import AuthError, AuthCancelledError, RefreshTokenError
 from src.YADISK.OAUTH.generate_pkce_pair import generate_pkce_params
 from src.YADISK.OAUTH.is_valid_redirect_uri import is_valid_redirect_uri
 from src.YADISK.OAUTH.tokenmanager import TokenManager
+from src.YADISK.http_session import SESSION
 from src.YADISK.yandextextmessage import YandexTextMessage as YT
 from src.GENERAL.constants import Constants as C
 from src.YADISK.yandexconst import YandexConstants as YC
@@ -36,11 +35,23 @@ logger = logging.getLogger(__name__)
 ACCESS_TOKEN_IN_TOKEN = "access_token"
 REFRESH_TOKEN_IN_TOKEN = "refresh_token"
 EXPIRES_IN_IN_TOKEN = "expires_in"
+CALLBACK_TIMEOUT_SECONDS = 120
+
+# Страница успешной авторизации не меняется — кодируем её один раз
+_SUCCESS_HTML_BYTES = YC.YANDEX_HTML_WINDOW_SUCCESSFUL.encode(C.ENCODING)
+_SUCCESS_CONTENT_TYPE = f"text/html; charset={C.ENCODING}"
+# Заголовки POST-запросов к token endpoint. Не изменять: общий объект для всех запросов
+_FORM_HEADERS = {"Content-Type": "application/x-www-form-urlencoded"}
+# Слушаем только IPv4-loopback: без разрешения имени localhost и без выхода в сеть
+CALLBACK_HOST = "127.0.0.1"
 
 
 class OAuthHTTPServer(HTTPServer):
     """Кастомный HTTP-сервер для OAuth-авторизации"""
 
+    # SO_REUSEADDR: повторная авторизация не упирается в порт в состоянии TIME_WAIT
+    allow_reuse_address = True
+
     def __init__(
         self, server_address: tuple[str, int], handler_class: Any, oauth_flow: OAuthFlow
     ) -> None:
@@ -66,15 +77,17 @@ class CallbackHandler(BaseHTTPRequestHandler):
 
         if "?" in self.path:
             state.callback_path = self.path
-            state.callback_received = True
-
-            threading.Thread(target=server.shutdown, daemon=True).start()
 
+            # Сначала полностью отдаём страницу браузеру, потом сигналим ожидающему потоку.
+            # Сервер останавливает OAuthFlow.full_auth_flow после wait_for_callback().
             self.send_response(200)
-            self.send_header("Content-type", f"text/html; charset={C.ENCODING}")
+            self.send_header("Content-type", _SUCCESS_CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(_SUCCESS_HTML_BYTES)))
             self.end_headers()
-            html: str = YC.YANDEX_HTML_WINDOW_SUCCESSFUL
-            self.wfile.write(html.encode(C.ENCODING))
+            self.wfile.write(_SUCCESS_HTML_BYTES)
+            self.wfile.flush()
+
+            state.callback_event.set()
         else:
             self.send_response(204)
             self.end_headers()
@@ -91,24 +104,27 @@ class OAuthFlow:
 
     Attributes:
         token_manager (TokenManager): Менеджер для работы с токенами
-        callback_received (bool): Флаг получения callback
+        callback_event (threading.Event): Событие получения callback
         callback_path (str): URL callback с кодом авторизации
         refresh_token (str): Текущий refresh token
         access_token (str): Текущий access token
-        _token_expires_at (float): Время истечения токена (timestamp)
+        _token_expires_at (float): Время истечения токена по часам time.monotonic()
+        _oauth_client (WebApplicationClient | None): Клиент oauthlib, создаётся при первом build_auth_url
         variables (EnvironmentVariables): Обертка для переменных окружения
     """
 
     def __init__(self) -> None:
         self.token_manager = TokenManager()
-        self.callback_received: bool = False
+        self.callback_event = threading.Event()
         self.callback_path: str | None = None
         self.refresh_token: str | None = None
         self.access_token: str | None = None
         self._token_expires_at: float = 0
-        self.variables = EnvironmentVariables()
+        self.variables: EnvironmentVariables = env()
         self.redirect_uri = self.variables.get_var(YC.YANDEX_REDIRECT_URI, "")
         self.yandex_client_id = self.variables.get_var(YC.ENV_YANDEX_CLIENT_ID, "")
+        self._oauth_client: Any = None
+        self._oauth_client_id: str | None = None
 
     def get_access_token(self) -> str | None:
         """Получает действительный access token"""
@@ -150,7 +166,9 @@ class OAuthFlow:
         if tokens:
             self.access_token = tokens[YC.YANDEX_ACCESS_TOKEN]
             self.refresh_token = tokens.get(YC.YANDEX_REFRESH_TOKEN)
-            self._token_expires_at = float(tokens[YC.YANDEX_EXPIRES_AT])
+            self._token_expires_at = self._wall_to_monotonic(
+                float(tokens[YC.YANDEX_EXPIRES_AT])
+            )
             logger.debug(YT.loaded_token)
             return tokens
 
@@ -178,7 +196,15 @@ class OAuthFlow:
 
     def is_token_expired(self) -> bool:
         """Проверяет, истек ли срок действия токена"""
-        return time.time() >= self._token_expires_at
+        return time.monotonic() >= self._token_expires_at
+
+    @staticmethod
+    def _wall_to_monotonic(wall_time: float) -> float:
+        """
+        Переводит момент времени из time.time() (так он хранится в keyring и понятен
+        другим процессам) в шкалу time.monotonic(), не зависящую от перевода системных часов.
+        """
+        return time.monotonic() + (wall_time - time.time())
 
     def run_full_auth_flow(self) -> str:
         """Выполняет полный цикл OAuth 2.0 аутентификации"""
@@ -192,12 +218,20 @@ class OAuthFlow:
 
     def full_auth_flow(self) -> str:
         """Содержательная часть метода start_full_auth_flow"""
+        # Поток живёт весь процесс: callback прошлой аутентификации не должен
+        # засчитаться этой (его код авторизации уже использован)
+        self.callback_event.clear()
+        self.callback_path = None
         code_verifier, code_challenge = generate_pkce_params()
         auth_url = self.build_auth_url(code_challenge)
-        self.start_auth_server()
+        server = self.start_auth_server()
 
-        self.open_browser(auth_url)
-        self.wait_for_callback()
+        try:
+            self.open_browser(auth_url)
+            self.wait_for_callback()
+        finally:
+            server.shutdown()
+            server.server_close()
 
         auth_code = self.parse_callback()
         token = self.exchange_token(auth_code, code_verifier)
@@ -211,9 +245,15 @@ class OAuthFlow:
                 YT.no_correct_redirect_uri.format(redirect_uri=self.redirect_uri)
             )
 
-        client = WebApplicationClient(self.yandex_client_id)
+        # oauthlib нужен только при полной аутентификации — импортируем по месту
+        from oauthlib.oauth2 import WebApplicationClient
+
+        # Клиент oauthlib создаётся один раз на client_id
+        if self._oauth_client is None or self._oauth_client_id != self.yandex_client_id:
+            self._oauth_client = WebApplicationClient(self.yandex_client_id)
+            self._oauth_client_id = self.yandex_client_id
 
-        return client.prepare_request_uri(
+        return self._oauth_client.prepare_request_uri(
             YC.URL_AUTORIZATION_YANDEX_OAuth,
             redirect_uri=self.redirect_uri,
             scope=YC.YANDEX_SCOPE,
@@ -223,7 +263,9 @@ class OAuthFlow:
 
     def start_auth_server(self) -> OAuthHTTPServer:
         """Запускает сервер для обработки callback"""
-        server = OAuthHTTPServer(("localhost", self.get_port()), CallbackHandler, self)
+        server = OAuthHTTPServer(
+            (CALLBACK_HOST, self.get_port()), CallbackHandler, self
+        )
         server_thread = threading.Thread(target=server.serve_forever)
         server_thread.daemon = True
         server_thread.start()
@@ -232,30 +274,29 @@ class OAuthFlow:
     @staticmethod
     def open_browser(auth_url: str) -> None:
         """Открывает браузер для авторизации"""
+        import webbrowser
+
         webbrowser.open(auth_url)
 
     def wait_for_callback(self) -> None:
         """Ожидает callback от OAuth провайдера"""
-        start_time = time.time()
-        while not self.callback_received:
-            if time.time() - start_time > 120:
-                raise TimeoutError(YT.callback_timeout)
-            time.sleep(0.1)
+        if not self.callback_event.wait(timeout=CALLBACK_TIMEOUT_SECONDS):
+            raise TimeoutError(YT.callback_timeout)
 
     def parse_callback(self) -> str:
         """Извлекает код авторизации из callback"""
         if not self.callback_path:
             raise AuthError(YT.no_callback_path)
 
-        query = urlparse(self.callback_path).query
-        params = parse_qs(query)
+        params = dict(
+            parse_qsl(urlparse(self.callback_path).query, keep_blank_values=True)
+        )
 
         if "error" in params:
-            error_code = params["error"][0]
-            error_desc = params.get("error_description", ["Unknown error"])[0]
-            raise AuthError(f"{error_code} - {error_desc}")
+            error_desc = params.get("error_description", "Unknown error")
+            raise AuthError(f"{params['error']} - {error_desc}")
 
-        auth_code = params.get("code", [""])[0]
+        auth_code = params.get("code")
         if not auth_code:
             raise AuthError(YT.no_auth_code)
         return auth_code
@@ -269,10 +310,10 @@ class OAuthFlow:
             "redirect_uri": self.redirect_uri,
         }
 
-        response = requests.post(
+        response = SESSION.post(
             YC.YANDEX_TOKEN_URL,
             data=token_data,
-            headers={"Content-Type": "application/x-www-form-urlencoded"},
+            headers=_FORM_HEADERS,
             timeout=30,
         )
         response.raise_for_status()
@@ -315,10 +356,10 @@ class OAuthFlow:
             "client_secret": self.variables.get_var(YC.ENV_YANDEX_CLIENT_SECRET),
         }
 
-        response = requests.post(
+        response = SESSION.post(
             YC.YANDEX_TOKEN_URL,
             data=token_data,
-            headers={"Content-Type": "application/x-www-form-urlencoded"},
+            headers=_FORM_HEADERS,
             timeout=30,
         )
 
@@ -365,19 +406,25 @@ class OAuthFlow:
             expires_in = float("inf")
             logger.info(YT.no_expires_in)
 
-        self._token_expires_at = time.time() + expires_in - 60.0
+        lifetime = expires_in - 60.0
+        self._token_expires_at = time.monotonic() + lifetime
 
-        return str(self._token_expires_at)
+        # Для keyring — по системным часам: значение читают другие процессы
+        return str(time.time() + lifetime)
 
-    @staticmethod
-    def get_port() -> int:
-        variables = EnvironmentVariables()
-        try:
-            uri = variables.get_var(YC.YANDEX_REDIRECT_URI)
-            parsed = urlparse(uri)
+    def get_port(self) -> int:
+        """Порт локального сервера из redirect_uri, прочитанного при создании объекта"""
+        return _redirect_port(self.redirect_uri)
 
-            if parsed.port is None or parsed.port == "":
-                raise ValueError(YT.invalid_port.format(e=""))
-            return parsed.port
-        except ValueError as e:
-            raise ValueError(YT.invalid_port.format(e=e)) from e
+
+@lru_cache(maxsize=8)
+def _redirect_port(uri: str) -> int:
+    """Разбирает redirect_uri и возвращает порт. Результат запоминается для каждого uri."""
+    try:
+        parsed = urlparse(uri)
+
+        if parsed.port is None or parsed.port == "":
+            raise ValueError(YT.invalid_port.format(e=""))
+        return parsed.port
+    except ValueError as e:
+        raise ValueError(YT.invalid_port.format(e=e)) from e
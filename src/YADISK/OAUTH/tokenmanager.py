@@ -3,13 +3,21 @@ import time
 import requests
 import logging
 
-from src.GENERAL.environment_variables import EnvironmentVariables
+from src.GENERAL.environment_variables import EnvironmentVariables, env
 from src.YADISK.OAUTH.exceptions import AuthError
+from src.YADISK.http_session import SESSION
 from src.YADISK.yandextextmessage import YandexTextMessage as YT
 from src.YADISK.yandexconst import YandexConstants as YC
 
 logger = logging.getLogger(__name__)
 
+VALIDATION_TTL_SECONDS = 300.0  # Сколько доверяем успешной проверке токена через API
+VALIDATION_EXPIRY_MARGIN_SECONDS = 60.0  # Запас до истечения срока действия токена
+VALIDATION_CACHE_MAX_SIZE = 1000
+
+# access_token -> момент (time.monotonic), до которого повторная проверка через API не нужна
+_VALIDATION_CACHE: dict[str, float] = {}
+
 
 class TokenManager:
     """Управляет жизненным циклом OAuth-токенов для Яндекс-Диска.
@@ -21,10 +29,13 @@ class TokenManager:
 
     Attributes:
         variables (EnvironmentVariables): Обертка для работы с переменными окружения и keyring
+        _known (dict[str, str | None]): Последние прочитанные/записанные значения keyring.
+            Неизменившиеся значения повторно в keyring не пишутся.
     """
 
     def __init__(self) -> None:
-        self.variables = EnvironmentVariables()
+        self.variables: EnvironmentVariables = env()
+        self._known: dict[str, str | None] = {}
 
     def save_tokens(
         self, access_token: str, refresh_token: str | None, expires_at: str
@@ -41,10 +52,18 @@ class TokenManager:
         """
         try:
             # Сохраняем токены и время истечения в компьютере (keyring)
-            self.variables.put_keyring_var(YC.YANDEX_ACCESS_TOKEN, access_token)
-            self.variables.put_keyring_var(YC.YANDEX_EXPIRES_AT, expires_at)
+            items = {
+                YC.YANDEX_ACCESS_TOKEN: access_token,
+                YC.YANDEX_EXPIRES_AT: expires_at,
+            }
             if refresh_token:
-                self.variables.put_keyring_var(YC.YANDEX_REFRESH_TOKEN, refresh_token)
+                items[YC.YANDEX_REFRESH_TOKEN] = refresh_token
+
+            for var_name, value in items.items():
+                if self._known.get(var_name) == value:
+                    continue  # значение в keyring не изменилось (обычно refresh_token)
+                self.variables.put_keyring_var(var_name, value)
+                self._known[var_name] = value
 
             logger.debug(YT.tokens_saved)
 
@@ -55,17 +74,27 @@ class TokenManager:
         access_token = self.variables.get_var(YC.YANDEX_ACCESS_TOKEN)
         refresh_token = self.variables.get_var(YC.YANDEX_REFRESH_TOKEN)
         expires_at = self.variables.get_var(YC.YANDEX_EXPIRES_AT)
-
-        logger.debug(
-            f"[Token Load] {YC.YANDEX_ACCESS_TOKEN}: {YC.PRESENT if access_token else YC.MISSING}"
-        )
-        logger.debug(
-            f"[Token Load] {YC.YANDEX_REFRESH_TOKEN}: {YC.PRESENT if refresh_token else YC.MISSING}"
-        )
-        logger.debug(
-            f"[Token Load] {YC.YANDEX_EXPIRES_AT}: {YC.PRESENT if expires_at else YC.MISSING}"
+        self._known.update(
+            {
+                YC.YANDEX_ACCESS_TOKEN: access_token,
+                YC.YANDEX_REFRESH_TOKEN: refresh_token,
+                YC.YANDEX_EXPIRES_AT: expires_at,
+            }
         )
 
+        if logger.isEnabledFor(
+            logging.DEBUG
+        ):  # f-строки не строим при выключенном DEBUG
+            logger.debug(
+                f"[Token Load] {YC.YANDEX_ACCESS_TOKEN}: {YC.PRESENT if access_token else YC.MISSING}"
+            )
+            logger.debug(
+                f"[Token Load] {YC.YANDEX_REFRESH_TOKEN}: {YC.PRESENT if refresh_token else YC.MISSING}"
+            )
+            logger.debug(
+                f"[Token Load] {YC.YANDEX_EXPIRES_AT}: {YC.PRESENT if expires_at else YC.MISSING}"
+            )
+
         return access_token, refresh_token, expires_at
 
     @staticmethod
@@ -100,8 +129,11 @@ class TokenManager:
             if not self._valid_expires_at(expires_at):
                 return None
 
-            if not self._validate_token_api(access_token):
-                return None
+            if not self._validated_recently(access_token):
+                if not self._validate_token_api(access_token):
+                    self.forget_validation(access_token)
+                    return None
+                self._remember_validation(access_token, float(expires_at))
 
             logger.debug(YT.valid_token_found.format(token=YC.YANDEX_ACCESS_TOKEN))
             return {
@@ -114,11 +146,39 @@ class TokenManager:
             logger.warning(YT.error_load_tokens.format(e=e))
             return None
 
+    @staticmethod
+    def _validated_recently(access_token: str) -> bool:
+        """Токен успешно проверялся через API не позднее VALIDATION_TTL_SECONDS назад"""
+        return _VALIDATION_CACHE.get(access_token, 0.0) > time.monotonic()
+
+    @staticmethod
+    def forget_validation(access_token: str) -> None:
+        """Забывает успешную проверку токена (API его отверг)"""
+        _VALIDATION_CACHE.pop(access_token, None)
+
+    @staticmethod
+    def _remember_validation(access_token: str, expires_at: float) -> None:
+        """
+        Запоминает успешную проверку токена.
+        Срок доверия не выходит за время жизни самого токена (с запасом).
+        """
+        ttl = min(
+            VALIDATION_TTL_SECONDS,
+            expires_at - time.time() - VALIDATION_EXPIRY_MARGIN_SECONDS,
+        )
+        if ttl <= 0:
+            return
+        if access_token not in _VALIDATION_CACHE:
+            while len(_VALIDATION_CACHE) >= VALIDATION_CACHE_MAX_SIZE:
+                # FIFO: словарь хранит порядок вставки
+                _VALIDATION_CACHE.pop(next(iter(_VALIDATION_CACHE)))
+        _VALIDATION_CACHE[access_token] = time.monotonic() + ttl
+
     @staticmethod
     def _validate_token_api(access_token: str) -> bool:
         """Проверяет валидность токена через API Яндекс-Диска"""
         try:
-            response = requests.get(
+            response = SESSION.get(
                 YC.URL_API_YANDEX_DISK,
                 headers={"Authorization": f"OAuth {access_token}"},
                 timeout=5,
@@ -0,0 +1,26 @@
+"""
+Общая HTTP-сессия для обращений к Яндексу: OAuth, API Яндекс-Диска, прямая загрузка файлов.
+
+Сессия держит keep-alive соединения в пуле, поэтому повторные запросы
+к тем же хостам не тратят время на новое TCP+TLS рукопожатие.
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Число пулов (хостов): oauth.yandex.ru, cloud-api.yandex.net, upload-хосты
+POOL_CONNECTIONS = 4
+POOL_MAXSIZE = 16  # Соединений в пуле одного хоста
+
+
+def _create_session() -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE, max_retries=0
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+SESSION = _create_session()
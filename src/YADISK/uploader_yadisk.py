@@ -1,36 +1,114 @@
 import os
 import logging
 import hashlib
+import string
+import time
 
 import requests
 from requests import Response
-from typing import BinaryIO
+from typing import BinaryIO, Iterator
 from tenacity import (
     retry,
     stop_after_attempt,
     wait_exponential,
     retry_if_exception,
+    retry_if_exception_type,
+    retry_if_not_exception_type,
     before_sleep_log,
 )
 from yadisk.exceptions import YaDiskError
 
+try:  # 5xx от API Яндекс-Диска (в yadisk >= 2); 429 — TooManyRequestsError, см. ниже
+    from yadisk.exceptions import RetriableYaDiskError
+except ImportError:  # pragma: no cover - старые/урезанные версии yadisk
+    RetriableYaDiskError = None
+
+try:  # 429 и сбои сети при обращении к API: в yadisk это не RetriableYaDiskError
+    from yadisk.exceptions import RequestError, TooManyRequestsError
+
+    API_TRANSIENT_EXCEPTIONS: tuple[type[Exception], ...] = (
+        TooManyRequestsError,
+        RequestError,  # в т.ч. RequestTimeoutError
+    )
+except ImportError:  # pragma: no cover - старые/урезанные версии yadisk
+    API_TRANSIENT_EXCEPTIONS = ()
+
+from src.YADISK.http_session import SESSION
 from src.YADISK.yandexconst import YandexConstants as YC
 from src.YADISK.yandextextmessage import YandexTextMessage as YT
 
 TESTING = os.getenv("TESTING", "0") == "1"
+# (соединение, чтение): мёртвый хост обнаруживается за секунды, медленная загрузка не обрывается
+UPLOAD_TIMEOUT = (YC.CONNECT_TIME_OUT_SECONDS, YC.TIME_OUT_SECONDS)
+API_TIMEOUT = (YC.CONNECT_TIME_OUT_SECONDS, YC.API_TIME_OUT_SECONDS)
+# Размер блока, отдаваемого в сокет при загрузке: тот же, что у высокоуровневого upload
+UPLOAD_BLOCK_SIZE = YC.CHUNK_SIZE
+# Сколько секунд upload_url можно переиспользовать после несовпадения MD5
+UPLOAD_URL_TTL_SECONDS = 50.0
+# Ответы, означающие, что ссылка для загрузки уже недействительна
+STALE_UPLOAD_URL_STATUSES = frozenset({403, 404, 410})
 logger = logging.getLogger(__name__)
 
 
-def _requests_put(url, data, timeout):
-    import requests
+def _requests_put(url, data, timeout, headers=None):
+    return SESSION.put(url, data=data, timeout=timeout, headers=headers)
+
+
+class _HashingReader:
+    """
+    Обёртка над открытым файлом: отдаёт данные для PUT-запроса и попутно считает MD5.
+
+    Благодаря __len__ requests выставляет Content-Length и не переходит
+    на chunked-передачу, а файл читается с диска один раз — и для отправки, и для хэша.
+    Метода read() нет намеренно: файловый объект urllib3 читал бы блоками по 16 КиБ,
+    а итератор отдаёт в сокет блоки по block_size.
+    Все блоки — срезы одного буфера: блок действителен только до запроса следующего
+    (urllib3 отправляет каждый блок в сокет сразу).
+    """
 
-    return requests.put(url, data=data, timeout=timeout)
+    def __init__(self, f: BinaryIO, block_size: int = UPLOAD_BLOCK_SIZE):
+        self._f = f
+        self._block_size = block_size
+        self._md5 = hashlib.md5()
+        self._remaining = os.fstat(f.fileno()).st_size - f.tell()
+
+    def __iter__(self) -> Iterator[memoryview]:
+        buffer = bytearray(
+            self._block_size
+        )  # один буфер на весь файл вместо bytes на блок
+        view = memoryview(buffer)
+        while size := self._f.readinto(buffer):
+            data = view[:size]
+            self._md5.update(data)
+            self._remaining -= size
+            yield data
+
+    def __len__(self) -> int:
+        return max(self._remaining, 0)
+
+    def hexdigest(self) -> str | None:
+        """MD5 отправленных данных или None, если файл прочитан не до конца."""
+        if self._remaining > 0:
+            return None
+        return self._md5.hexdigest()
 
 
 class HashMismatchError(Exception):
     """Выбрасывается при несовпадении контрольных сумм после загрузки."""
 
 
+# Поводы для повтора: несовпадение MD5, сбои сети без ответа сервера, 429/5xx от API
+RETRYABLE_EXCEPTIONS = (
+    HashMismatchError,
+    requests.exceptions.Timeout,
+    requests.exceptions.ConnectionError,
+    requests.exceptions.ChunkedEncodingError,
+    *API_TRANSIENT_EXCEPTIONS,
+) + ((RetriableYaDiskError,) if RetriableYaDiskError is not None else ())
+# Подклассы ConnectionError, которые повтором не исправить
+FATAL_REQUEST_EXCEPTIONS = (requests.exceptions.SSLError,)
+
+
 class UploaderToYaDisk:
     """
     Класс для прямой загрузки файлов на Яндекс-Диск с поддержкой повторных попыток
@@ -41,7 +119,8 @@ class UploaderToYaDisk:
     - Получение одноразового upload URL перед каждой попыткой загрузки.
     - Отправка файла на Яндекс-Диск через PUT-запрос с использованием requests.
     - Обработка HTTP- и сетевых ошибок с помощью retry-механизма библиотеки tenacity.
-    - Проверка целостности загруженного файла (MD5) после каждой успешной отправки.
+    - Проверка целостности загруженного файла (MD5) после каждой успешной отправки;
+      локальный MD5 считается по ходу отправки, без повторного чтения файла.
     - Логирование ключевых этапов загрузки и ошибок.
 
     Механизм повторных попыток:
@@ -75,6 +154,15 @@ class UploaderToYaDisk:
     def __init__(self, ya_disk, remote_path: str):
         self.ya_disk = ya_disk
         self.remote_path = remote_path
+        # Проверка после прошлой попытки уже показала, что файл в облаке отличается
+        self._known_mismatch = False
+        # upload_url прошлой попытки и момент его получения (time.monotonic)
+        self._upload_url: str | None = None
+        self._upload_url_at = 0.0
+        # MD5 из заголовка ETag ответа на последний PUT (если сервер его прислал)
+        self._put_etag: str | None = None
+        # PUT уже отправлялся: по remote_path может лежать результат прошлой попытки
+        self._put_attempted = False
 
     @staticmethod
     def _is_retryable_status(code: int) -> bool:
@@ -93,83 +181,168 @@ class UploaderToYaDisk:
         Получает одноразовую ссылку для загрузки на Яндекс-Диск.
         Обрабатывает разные форматы ответа API.
         """
-        try:
-            res = self.ya_disk.get_upload_link(self.remote_path, overwrite=True)
-
-            # Вариант 1: сразу строка
-            if isinstance(res, str):
-                return res
+        # Ошибки API (YaDiskError и её подклассы) и сетевые ошибки requests не оборачиваем:
+        # по их типу и статусу ответа политика повторов решает, стоит ли повторять
+        res = self.ya_disk.get_upload_link(
+            self.remote_path, overwrite=True, timeout=API_TIMEOUT
+        )
 
-            # Вариант 2: dict с ключом 'href'
-            if isinstance(res, dict) and "href" in res:
-                return res["href"]
+        # Вариант 1: сразу строка
+        if isinstance(res, str):
+            return res
 
-            # Вариант 3: объект с атрибутом .href
-            href = getattr(res, "href", None)
-            if isinstance(href, str) and href:
-                return href
+        # Вариант 2: dict с ключом 'href'
+        if isinstance(res, dict) and "href" in res:
+            return res["href"]
 
-        except Exception as e:
-            raise YaDiskError from e
+        # Вариант 3: объект с атрибутом .href
+        href = getattr(res, "href", None)
+        if isinstance(href, str) and href:
+            return href
 
         # Если формат неожиданный — записываем в лог и падаем с понятной ошибкой
         message = YT.unknown_error.format(type=f"{type(res)!r}", res=f"{res!r}", e="")
         logger.error(message)
         raise ValueError(message)
 
-    # --- Фильтр: по каким ошибкам повторяем ---
+    # --- Фильтр: по каким HTTP-ответам повторяем ---
     @staticmethod
-    def _should_retry(exc: BaseException) -> bool:
+    def _retry_on_http_status(exc: BaseException) -> bool:
         """
-        Определяет, нужно ли повторить операцию при возникновении исключения.
-        Вызывается библиотекой tenacity перед повтором.
+        Определяет, нужно ли повторить операцию после HTTP-ошибки, по статусу ответа.
+        Вызывается библиотекой tenacity перед повтором. Остальные поводы для повтора
+        задаются типами исключений (RETRYABLE_EXCEPTIONS).
         """
+        if not isinstance(exc, requests.exceptions.HTTPError):
+            return False
+        resp: Response | None = exc.response
+        if resp is None or resp.status_code is None:
+            return False
+        return UploaderToYaDisk._is_retryable_status(resp.status_code)
 
-        # 1) Наши «ожидаемые» поводы для повтора
-        if isinstance(exc, HashMismatchError):
-            return True
-
-        # 2) Сетевая ошибка
-        if isinstance(exc, requests.exceptions.RequestException):
-
-            resp: Response = getattr(exc, "response", None)
-            if resp is not None and resp.status_code is not None:
-                return UploaderToYaDisk._is_retryable_status(resp.status_code)
-
-            return True  # нет ответа (timeout/connect error) — повторяем
+    def write_file_direct(self, local_path: str) -> None:
+        """
+        Загружает локальный файл на Яндекс-Диск напрямую (без chunk-режима).
+        Если повтор застаёт на Яндекс-Диске файл с тем же MD5 (PUT прошлой попытки
+        дошёл, а ответ потерян), повторная отправка пропускается.
+        Файл открывается один раз на все попытки загрузки.
+        """
 
-        # 3) По умолчанию — не повторяем (например, FileNotFoundError и пр.)
-        return False
+        self._put_attempted = False
+        # Если файл не найден — FileNotFoundError сразу, без повторов
+        with self._open_local_file(path=local_path) as f:
+            self._upload_once(local_path=local_path, f=f)
 
     @retry(
         stop=stop_after_attempt(5),
         wait=wait_exponential(multiplier=1, min=4, max=10),
-        retry=retry_if_exception(_should_retry),
+        retry=(
+            (
+                retry_if_exception_type(RETRYABLE_EXCEPTIONS)
+                & retry_if_not_exception_type(FATAL_REQUEST_EXCEPTIONS)
+            )
+            | retry_if_exception(_retry_on_http_status)
+        ),
         before_sleep=before_sleep_log(logger, logging.INFO),
         reraise=True,
     )
-    def write_file_direct(self, local_path: str) -> None:
+    def _upload_once(self, local_path: str, f: BinaryIO) -> None:
         """
-        Загружает локальный файл на Яндекс-Диск напрямую (без chunk-режима).
+        Одна попытка загрузки уже открытого файла. Повторяется tenacity.
+        :param local_path: Путь на локальный файл
+        :param f: Открытый на чтение локальный файл
         """
 
-        # 1) Открываем локальный файл
-        with self._open_local_file(path=local_path) as f:
-            logger.info(YT.start_fast_load.format(local_path=local_path))
+        # 0) Точно такой же файл уже в облаке — после сбоя PUT прошлой попытки.
+        #    До первого PUT по новому имени файла нет: проверка была бы заведомым 404.
+        #    Если прошлая попытка закончилась несовпадением MD5, ответ известен без запроса.
+        known_mismatch, self._known_mismatch = self._known_mismatch, False
+        preflight = self._put_attempted and not known_mismatch
+        if preflight and self._already_uploaded(local_path):
+            logger.info(
+                YT.already_uploaded.format(
+                    local_path=local_path, remote_path=self.remote_path
+                )
+            )
+            return
 
-            # 2) На КАЖДОЙ попытке берём новый upload_url
-            upload_url = self._get_upload_url()
+        # 1) Файл перематывает на начало сам _put_file — перед каждым PUT
+        logger.info(YT.start_fast_load.format(local_path=local_path))
 
-            # 3) Загрузка файла с таймаутом
-            self._put_file(upload_url=upload_url, f=f, timeout=YC.TIME_OUT_SECONDS)
+        # 2) После несовпадения MD5 свежий upload_url прошлой попытки используем повторно,
+        #    после сетевых и HTTP-ошибок — берём новый
+        reuse = known_mismatch and self._fresh_upload_url() is not None
+        upload_url = self._upload_url if reuse else self._new_upload_url()
+
+        # 3) Загрузка файла с таймаутом; MD5 считается по ходу отправки
+        self._put_attempted = True
+        try:
+            local_md5 = self._put_file(
+                upload_url=upload_url, f=f, timeout=UPLOAD_TIMEOUT
+            )
+        except requests.exceptions.RequestException as e:
+            self._upload_url = None
+            if not (reuse and self._is_stale_upload_url(e)):
+                raise
+            # Сохранённая ссылка уже недействительна — сразу повторяем с новой
+            local_md5 = self._put_file(
+                upload_url=self._new_upload_url(), f=f, timeout=UPLOAD_TIMEOUT
+            )
 
         # 4) Контроль целостности (MD5 локальный vs MD5 из метаданных Яндекс-Диска)
-        self._verify_integrity(local_path=local_path, remote_path=self.remote_path)
+        self._verify_integrity(
+            local_path=local_path, remote_path=self.remote_path, local_md5=local_md5
+        )
+        self._upload_url = None
         # 5) Успех
         logger.info(
             YT.finish_load.format(local_path=local_path, remote_path=self.remote_path)
         )
 
+    def _new_upload_url(self) -> str:
+        """
+        Получает новый upload_url и запоминает его для возможного повтора после несовпадения MD5.
+        :return: URL для загрузки файла
+        """
+        self._upload_url = self._get_upload_url()
+        self._upload_url_at = time.monotonic()
+        return self._upload_url
+
+    def _fresh_upload_url(self) -> str | None:
+        """
+        Возвращает сохранённый upload_url, если он ещё не устарел.
+        :return: upload_url, полученный не раньше UPLOAD_URL_TTL_SECONDS назад, иначе None
+        """
+        if time.monotonic() - self._upload_url_at > UPLOAD_URL_TTL_SECONDS:
+            return None
+        return self._upload_url
+
+    @staticmethod
+    def _is_stale_upload_url(exc: requests.exceptions.RequestException) -> bool:
+        """
+        Проверяет, отверг ли сервер сохранённый upload_url как недействительный.
+        :param exc: Ошибка загрузки по сохранённому upload_url
+        :return: True - ссылка недействительна, нужна новая
+        """
+        resp = getattr(exc, "response", None)
+        return resp is not None and resp.status_code in STALE_UPLOAD_URL_STATUSES
+
+    def _already_uploaded(self, local_path: str) -> bool:
+        """
+        Проверяет, лежит ли по remote_path уже файл с тем же содержимым.
+        Сначала запрашиваются метаданные облака; локальный MD5 считается,
+        только если удалённый файл существует.
+        :param local_path: Путь на локальный файл
+        :return: True - загрузка не нужна, False - файл надо загружать
+        """
+        try:
+            remote_md5 = self.get_remote_md5_yadisk(self.remote_path)
+        except YaDiskError:
+            return False  # файла в облаке нет — обычная загрузка
+        if not remote_md5:
+            return False
+        return self.calculate_md5(local_path).lower() == remote_md5.lower()
+
     @staticmethod
     def _open_local_file(path: str) -> BinaryIO:
         """
@@ -182,24 +355,41 @@ class UploaderToYaDisk:
             return open(path, "rb")
         except FileNotFoundError:
             logger.error(YT.local_file_not_found.format(path=path))
-            raise  # tenacity не будет повторять (см. _should_retry)
+            raise  # tenacity не будет повторять (см. RETRYABLE_EXCEPTIONS)
 
-    def _put_file(self, upload_url: str, f: BinaryIO, timeout: int) -> None:
+    def _put_file(
+        self, upload_url: str, f: BinaryIO, timeout: float | tuple[float, float]
+    ) -> str | None:
         """
         Отправка файла в облако
         :param upload_url: URL для загрузки файла
         :param f: Загружаемый файл
-        :param timeout: Тайм-аут в секундах
-        :return: ответ сервера
+        :param timeout: Тайм-аут в секундах или пара (соединение, чтение)
+        :return: MD5 отправленного файла или None, если его не удалось посчитать по ходу отправки
         """
+        self._put_etag = None
+        # Любой PUT отправляет файл целиком, как бы далеко ни зашла прошлая попытка
+        f.seek(0)
         if TESTING:
             # имитация успешной отправки
-            return
+            return None
 
         try:
-            resp = _requests_put(upload_url, data=f, timeout=timeout)
+            reader = _HashingReader(f)
+            # Размер известен заранее: обычный PUT с Content-Length, без chunked-кодирования
+            headers = {
+                "Content-Length": str(len(reader)),
+                "Content-Type": "application/octet-stream",
+            }
+            # Для пустого итератора requests добавил бы Transfer-Encoding: chunked
+            # к Content-Length: 0 — пустой файл отправляем пустыми байтами
+            body = reader if len(reader) else b""
+            resp = _requests_put(
+                upload_url, data=body, timeout=timeout, headers=headers
+            )
             self._raise_for_bad_status(resp)
-            return
+            self._put_etag = self._etag_md5(resp)
+            return reader.hexdigest()
         except requests.exceptions.RequestException as e:
             logger.info(YT.error_network.format(e=e))
             raise  # tenacity поймает и решит, повторять ли
@@ -218,28 +408,58 @@ class UploaderToYaDisk:
             e.response = resp
             raise
 
-    def _verify_integrity(self, local_path: str, remote_path: str) -> None:
+    @staticmethod
+    def _etag_md5(resp: requests.Response) -> str | None:
+        """
+        Достаёт MD5 из заголовка ETag ответа на PUT.
+        :param resp: ответ на запрос
+        :return: MD5 в нижнем регистре или None, если ETag нет или он не похож на MD5
+        """
+        headers = getattr(resp, "headers", None) or {}
+        etag = (headers.get("Etag") or "").removeprefix("W/").strip('"').lower()
+        if len(etag) == 32 and all(c in string.hexdigits for c in etag):
+            return etag
+        return None
+
+    def _verify_integrity(
+        self, local_path: str, remote_path: str, local_md5: str | None = None
+    ) -> None:
         """
         MD5-проверка локального и записанного в облако файлов и, при необходимости, выброс HashMismatchError.
+        Если ETag ответа на PUT совпал с локальным MD5, метаданные облака не запрашиваются.
         :param local_path: Путь на локальный файл.
         :param remote_path: Путь на записанный в облако файл.
+        :param local_md5: MD5, посчитанный при отправке. Если None — файл перечитывается.
         :return:
         """
+        if local_md5 is None:
+            local_md5 = self.calculate_md5(local_path)
+        if self._put_etag is not None and self._put_etag == local_md5.lower():
+            return
+        # ETag нет или он не совпал — решают метаданные Яндекс-Диска
         if (
-            not self.calculate_md5(local_path).lower()
+            not local_md5.lower()
             == (self.get_remote_md5_yadisk(remote_path) or "").lower()
         ):
             logger.info(YT.mismatch_MD5.format(remote_path=remote_path))
+            self._known_mismatch = True
             raise HashMismatchError
 
     @staticmethod
     def calculate_md5(file_path: str, chunk_size: int = YC.CHUNK_SIZE) -> str:
         """Вычисляет MD5-хэш файла (по частям)."""
 
-        h = hashlib.md5()
-        with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(chunk_size), b""):
-                h.update(chunk)
+        # buffering=0: читаем прямо в свой буфер, без промежуточного BufferedReader
+        with open(file_path, "rb", buffering=0) as f:
+            if hasattr(hashlib, "file_digest"):  # Python 3.11+: цикл чтения внутри C
+                return hashlib.file_digest(f, "md5").hexdigest()
+
+            # Один переиспользуемый буфер вместо нового bytes на каждой итерации
+            h = hashlib.md5()
+            buf = bytearray(chunk_size)
+            view = memoryview(buf)
+            while n := f.readinto(buf):
+                h.update(view[:n])
         return h.hexdigest()
 
     def get_remote_md5_yadisk(self, remote_path: str) -> str | None:
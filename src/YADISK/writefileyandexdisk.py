@@ -26,8 +26,11 @@ def write_file_to_yandex_disk(
     """
     logger.info(YT.init_load_to_disk)
     try:
-        yandex_disk = YandexDisk(remote_dir=remote_dir, call_back_obj=call_back_obj)
-        if not (_remote_path := yandex_disk.write_file_fast(local_path)):
+        with YandexDisk(
+            remote_dir=remote_dir, call_back_obj=call_back_obj
+        ) as yandex_disk:
+            _remote_path = yandex_disk.write_file_fast(local_path)
+        if not _remote_path:
             raise OSError(YT.error_API_Yandex_disk)
 
         return _remote_path
@@ -15,7 +15,10 @@
 
 import time
 import os
+import posixpath
 import logging
+import threading
+from functools import cached_property, lru_cache
 from typing import cast
 
 from tenacity import (
@@ -30,6 +33,7 @@ from yadisk.exceptions import (
     YaDiskError,
     UnauthorizedError,
     BadRequestError,
+    PathNotFoundError,
 )
 
 from src.GENERAL.remote_archive_naming import RemoteArchiveNamingProtokol
@@ -39,9 +43,36 @@ from src.YADISK.yandexconst import YandexConstants as YC
 from src.YADISK.uploader_yadisk import UploaderToYaDisk
 
 TESTING = os.getenv("TESTING", "0") == "1"
+LISTDIR_FIELDS = ["name"]  # Из элементов директории нужны только имена
+LISTDIR_PAGE_LIMIT = (
+    1000  # Элементов на страницу ответа (меньше запросов на больших папках)
+)
 
 logger = logging.getLogger(__name__)
 
+# Один OAuth-поток на процесс: токен в памяти переживает создание новых YandexDisk
+_TOKEN_LOCK = threading.Lock()
+# Папки на диске, существование которых уже подтверждено в этом процессе.
+# Ключи — нормализованные пути вида "/Архивы/2025_08" (см. _remote_dir_key)
+_KNOWN_REMOTE_DIRS: set[str] = set()
+
+
+def _remote_dir_key(path: str) -> str:
+    """Нормализованный путь папки для _KNOWN_REMOTE_DIRS: один ведущий "/", без завершающего."""
+    return "/" + path.strip("/")
+
+
+def _forget_remote_dir(path: str) -> None:
+    """
+    Забывает папку и всех её предков: если папки нет, могли удалить и родительские,
+    и следующая попытка должна проверить их заново.
+    :param path: Путь папки на Яндекс-Диске
+    """
+    key = _remote_dir_key(path)
+    while key != "/":
+        _KNOWN_REMOTE_DIRS.discard(key)
+        key = posixpath.dirname(key)
+
 
 # noinspection PyMethodMayBeStatic
 class _Client:
@@ -62,7 +93,7 @@ class _Client:
         # объект с атрибутом md5
         return type("M", (), {"md5": "0" * 32})()
 
-    def get_upload_link(self, path: str):
+    def get_upload_link(self, path: str, **kwargs):
         # форма, совместимая с реальным API
         return {"href": "http://dummy"}
 
@@ -72,10 +103,11 @@ class _Client:
         # безопасный no operation для тестов
         return None
 
-    def listdir(self, path: str):
+    def listdir(self, path: str, **kwargs):
         return []
 
 
+@lru_cache(maxsize=1)
 def get_oauth_flow():
     from src.YADISK.OAUTH.oauthflow import OAuthFlow
 
@@ -83,14 +115,29 @@ def get_oauth_flow():
 
 
 def get_token():
-    flow = get_oauth_flow()
-    token = flow.get_access_token()
+    with _TOKEN_LOCK:
+        flow = get_oauth_flow()
+        token = flow.get_access_token()
     if not token:
         # тот же текст, что использовался ниже
         raise PermissionError(YT.no_valid_token)
     return token
 
 
+def invalidate_token(access_token: str | None = None) -> None:
+    """
+    Забывает закешированный OAuth-поток и успешную проверку токена.
+    Вызывается, когда API отверг токен: следующий get_token получит токен заново.
+    :param access_token: Отвергнутый токен
+    """
+    from src.YADISK.OAUTH.tokenmanager import TokenManager
+
+    with _TOKEN_LOCK:
+        get_oauth_flow.cache_clear()
+    if access_token:
+        TokenManager.forget_validation(access_token)
+
+
 class YandexDisk:
     """Класс для работы с файлами (архивами) на Яндекс-Диске"""
 
@@ -113,17 +160,40 @@ class YandexDisk:
 
         self.call_back_obj = call_back_obj  # Объект с call_back функциями.
         self.remote_path: str = ""
+        # Токен, клиент yadisk и папка архивов создаются лениво — при первом обращении
 
-        self.access_token: str | None = (
-            self.get_token_for_API()
-        )  # токен доступа к Яндекс-Диску
-
-        if self.access_token is None:
+    @cached_property
+    def access_token(self) -> str:
+        """Токен доступа к Яндекс-Диску (OAuth-поток запускается при первом обращении)."""
+        access_token = self.get_token_for_API()
+        if access_token is None:
             raise PermissionError("Не получен access token")
+        return access_token
 
-        self.ya_disk = self.init_ya_disk(self.access_token)
+    @cached_property
+    def ya_disk(self) -> YaDisk:
+        """Клиент yadisk, созданный при первом обращении."""
+        return self.init_ya_disk(self.access_token)
+
+    @cached_property
+    def remote_dir(self) -> str:
+        """Директория архивов на Яндекс-Диске (наличие проверяет create_remote_path)."""
+        # CALLBACK
+        return self.call_back_obj.generate_path_remote_dir()
 
-        self.remote_dir = self.create_remote_dir()
+    def close(self) -> None:
+        """Закрывает HTTP-сессии клиента yadisk (пул keep-alive соединений)."""
+        if "ya_disk" not in self.__dict__:
+            return  # клиент не создавался — закрывать нечего
+        close = getattr(self.ya_disk, "close", None)
+        if callable(close):
+            close()
+
+    def __enter__(self) -> "YandexDisk":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
 
     @staticmethod
     def _get_ya_disk(access_token: str) -> YaDisk:
@@ -138,6 +208,7 @@ class YandexDisk:
                 return disk
 
             logger.info(YT.authorization_error.format(e=""))
+            invalidate_token(access_token)
             raise PermissionError
 
         except PermissionError:
@@ -145,6 +216,7 @@ class YandexDisk:
 
         except UnauthorizedError as e:
             logger.error(YT.authorization_error.format(e=e))
+            invalidate_token(access_token)
             raise PermissionError from e
 
         except BadRequestError as e:
@@ -167,10 +239,13 @@ class YandexDisk:
         try:
             # CALLBACK
             remote_dir = self.call_back_obj.generate_path_remote_dir()
+            if _remote_dir_key(remote_dir) in _KNOWN_REMOTE_DIRS:
+                return remote_dir
             if not self.ya_disk.exists(remote_dir):
                 logger.info(YT.folder_not_found.format(remote_dir=remote_dir))
                 current_path = self.mkdir_custom(remote_dir)  # Создаём папку с архивами
                 logger.info(YT.folder_created.format(current_path=current_path))
+            _KNOWN_REMOTE_DIRS.add(_remote_dir_key(remote_dir))
             return remote_dir
         except Exception as e:
             raise YaDiskError(YT.error_create_directory_ya_disk.format(e=e))
@@ -182,9 +257,9 @@ class YandexDisk:
         """
         try:
             logger.info(YT.get_token)
-            self.access_token = get_token()
+            access_token = get_token()
             logger.debug(YT.valid_token)
-            return self.access_token
+            return access_token
         except Exception as e:
             raise PermissionError(YT.get_token_error.format(e=e)) from e
 
@@ -195,18 +270,31 @@ class YandexDisk:
         return self._get_ya_disk(access_token)
 
     def create_remote_path(self) -> str:
-        for item in self.ya_disk.listdir(self.remote_dir):
-            if item is not None and item.name is not None:
-                # CALLBACK
-                self.call_back_obj.accept_remote_directory_element(item.name)
+        # CALLBACK — метод связывается один раз, а не ищется для каждого элемента
+        accept = self.call_back_obj.accept_remote_directory_element
+        # Ответ API урезается до имён элементов — меньше JSON и объектов на элемент.
+        # Листинг заодно проверяет наличие папки: отдельный exists() не нужен
+        try:
+            for item in self.ya_disk.listdir(
+                self.remote_dir, fields=LISTDIR_FIELDS, limit=LISTDIR_PAGE_LIMIT
+            ):
+                if item is None:
+                    continue
+                name = item.name
+                if name is not None:
+                    accept(name)
+        except PathNotFoundError:
+            _forget_remote_dir(self.remote_dir)  # Папку удалили вне программы
+            self.create_remote_dir()  # Папки нет — создаём, архивов в ней нет
 
         # CALLBACK
         return self.call_back_obj.generate_path_remote_file()
 
     def _upload_file(self, local_path: str, remote_path: str) -> None:
         """Выполняет загрузку файла и логирует время (через high-level API yadisk)."""
-        logger.debug(YT.load.format(local_path=local_path, remote_path=remote_path))
-        t_start = time.time()
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(YT.load.format(local_path=local_path, remote_path=remote_path))
+        t_start = time.perf_counter()
         self.ya_disk.upload(
             local_path,
             remote_path,
@@ -214,8 +302,9 @@ class YandexDisk:
             timeout=YC.TIME_OUT_SECONDS,
             chunk_size=YC.CHUNK_SIZE,
         )
-        during = f"{time.time() - t_start:.2f}"
-        logger.info(YT.during.format(during=during))
+        if logger.isEnabledFor(logging.INFO):
+            during = f"{time.perf_counter() - t_start:.2f}"
+            logger.info(YT.during.format(during=during))
 
     def write_file_fast(self, local_path: str) -> str | None:
         """
@@ -261,15 +350,19 @@ class YandexDisk:
         :param path: Путь, например: "Архивы/2025/08"
         :return: Абсолютный путь, который был создан
         """
+        current_path = ""
         try:
             parts = path.strip("/").split("/")
-            current_path = ""
             for part in parts:
                 current_path += f"/{part}"
+                if current_path in _KNOWN_REMOTE_DIRS:
+                    continue  # Уже проверена или создана — без запроса к API
                 if not self.ya_disk.exists(current_path):
                     self.ya_disk.mkdir(current_path)
+                _KNOWN_REMOTE_DIRS.add(current_path)
             return current_path
 
         except Exception as e:
+            _forget_remote_dir(current_path)
             logger.error(YT.error_create_directory_ya_disk.format(e=e))
             raise YaDiskError from e
@@ -10,7 +10,9 @@ class YandexConstants(frozenset):
     ENV_YANDEX_CLIENT_SECRET = "YANDEX_CLIENT_SECRET"
     MISSING = " ** --> Отсутствуют"
     PRESENT = "Представлены"
-    TIME_OUT_SECONDS = 90
+    TIME_OUT_SECONDS = 90  # Тайм-аут чтения при передаче файла
+    CONNECT_TIME_OUT_SECONDS = 5  # Тайм-аут установления соединения
+    API_TIME_OUT_SECONDS = 15  # Тайм-аут чтения ответа на короткие запросы к API
     URL_API_YANDEX_DISK = "https://cloud-api.yandex.net/v1/disk"
     URL_AUTORIZATION_YANDEX_OAuth = "https://oauth.yandex.ru/authorize"
     YANDEX_HTML_WINDOW_SUCCESSFUL = """
@@ -1,4 +1,7 @@
 class YandexTextMessage(frozenset):
+    already_uploaded = (
+        "Файл {local_path} уже есть на Яндекс-Диске в {remote_path} — загрузка не нужна"
+    )
     authorization_error = "Ошибка авторизации {e}"
     authorization_timeout = "Превышено время ожидания авторизации {e}"
     callback_timeout = "Тайм-аут ожидания ответа от Яндекса во время авторизации"
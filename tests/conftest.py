@@ -52,10 +52,13 @@ def _dummy_yadisk(monkeypatch):
 
     class BadRequestError(YaDiskError): ...
 
+    class PathNotFoundError(YaDiskError): ...
+
     exc_mod = types.SimpleNamespace(
         YaDiskError=YaDiskError,
         UnauthorizedError=UnauthorizedError,
         BadRequestError=BadRequestError,
+        PathNotFoundError=PathNotFoundError,
     )
     sys.modules["yadisk.exceptions"] = exc_mod
 
@@ -73,7 +76,7 @@ def _dummy_yadisk(monkeypatch):
         def mkdir(self, path):
             return None
 
-        def listdir(self, path):
+        def listdir(self, path, **kwargs):
             return []
 
         def get_upload_link(self, path):
@@ -131,3 +134,20 @@ def _stub_browser(monkeypatch):
     monkeypatch.setattr(webbrowser, "open_new", fake_open, raising=True)
     monkeypatch.setattr(webbrowser, "open_new_tab", fake_open, raising=True)
     return opened
+
+
+@pytest.fixture(autouse=True)
+def _clear_process_caches():
+    from src.GENERAL.environment_variables import env
+
+    def clear():
+        env.cache_clear()
+        # Импорт yandex_disk здесь изменил бы порядок подмены yadisk — чистим, только если загружен
+        yandex_disk = sys.modules.get("src.YADISK.yandex_disk")
+        if yandex_disk is not None:
+            yandex_disk.get_oauth_flow.cache_clear()
+            yandex_disk._KNOWN_REMOTE_DIRS.clear()
+
+    clear()
+    yield
+    clear()
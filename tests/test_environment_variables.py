@@ -95,3 +95,22 @@ def test_validate_vars_raises_when_required_values_are_missing(environment):
 
     with pytest.raises(RuntimeError):
         ev.validate_vars()
+
+
+def test_external_keyring_change_is_seen(environment):
+    ev, keyring = environment
+    keyring.set_password(ev.app_name, "SECRET", "v1")
+    assert ev.get_var("SECRET") == "v1"
+
+    # Токен обновил другой процесс — экземпляр не должен держать старое значение
+    keyring.set_password(ev.app_name, "SECRET", "v2")
+    assert ev.get_var("SECRET") == "v2"
+
+
+def test_env_is_process_singleton(monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        envmod.dotenv, "load_dotenv", lambda **k: calls.append(1) or True
+    )
+    assert envmod.env() is envmod.env()
+    assert len(calls) == 1
@@ -1,4 +1,5 @@
 import types, pytest
+import oauthlib.oauth2
 from src.YADISK.OAUTH import oauthflow as oflow
 from src.YADISK.OAUTH.oauthflow import OAuthFlow
 from src.YADISK.OAUTH.exceptions import AuthCancelledError, AuthError
@@ -29,10 +30,10 @@ def test_token_in_memory_and_expiry(monkeypatch):
     f = _mk_flow()
     f.access_token = "tok"
     f._token_expires_at = 2000.0
-    monkeypatch.setattr(oflow.time, "time", lambda: 1000.0, raising=True)
+    monkeypatch.setattr(oflow.time, "monotonic", lambda: 1000.0, raising=True)
     assert f.token_in_memory() == "tok"
     # simulate expiry
-    monkeypatch.setattr(oflow.time, "time", lambda: 3000.0, raising=True)
+    monkeypatch.setattr(oflow.time, "monotonic", lambda: 3000.0, raising=True)
     assert f.token_in_memory() is None
 
 
@@ -45,11 +46,14 @@ def test_loaded_tokens_sets_state(monkeypatch):
             YC.YANDEX_EXPIRES_AT: "1234",
         }
     )
+    monkeypatch.setattr(oflow.time, "time", lambda: 1000.0, raising=True)
+    monkeypatch.setattr(oflow.time, "monotonic", lambda: 50.0, raising=True)
     tokens = f.loaded_tokens()
     assert tokens
     assert f.access_token == "A"
     assert f.refresh_token == "R"
-    assert f._token_expires_at == 1234.0
+    # 1234 по системным часам = через 234 сек = 50 + 234 по monotonic
+    assert f._token_expires_at == 284.0
 
 
 def test_updated_tokens_saves_and_sets(monkeypatch):
@@ -86,7 +90,7 @@ def test_build_auth_url_valid(monkeypatch):
         def prepare_request_uri(self, *a, **k):
             return "AUTH_URL"
 
-    monkeypatch.setattr(oflow, "WebApplicationClient", DC, raising=True)
+    monkeypatch.setattr(oauthlib.oauth2, "WebApplicationClient", DC, raising=True)
     url = f.build_auth_url("challenge")
     assert url == "AUTH_URL"
 
@@ -118,3 +122,24 @@ def test_run_full_auth_flow_wrapping(monkeypatch):
     )
     with pytest.raises(AuthError):
         f.run_full_auth_flow()
+
+
+def test_build_auth_url_reuses_client(monkeypatch):
+    f = _mk_flow()
+    monkeypatch.setattr(oflow, "is_valid_redirect_uri", lambda _: True, raising=True)
+    created = []
+
+    class DC:
+        def __init__(self, client_id):
+            created.append(client_id)
+
+        def prepare_request_uri(self, *a, **k):
+            return "AUTH_URL"
+
+    monkeypatch.setattr(oauthlib.oauth2, "WebApplicationClient", DC, raising=True)
+    f.yandex_client_id = "cid"
+    f.build_auth_url("c1")
+    f.build_auth_url("c2")
+    f.yandex_client_id = "other"
+    f.build_auth_url("c3")
+    assert created == ["cid", "other"]
@@ -1,5 +1,6 @@
 import types, pytest
 from src.YADISK.OAUTH.oauthflow import OAuthFlow
+import src.YADISK.OAUTH.oauthflow as oflow
 from src.YADISK.yandexconst import YandexConstants as YC
 
 
@@ -27,12 +28,14 @@ def test_loaded_tokens_sets_state(monkeypatch):
     f.token_manager = types.SimpleNamespace(
         load_and_validate_exist_tokens=lambda: tokens
     )
+    monkeypatch.setattr(oflow.time, "time", lambda: 1000.0, raising=True)
+    monkeypatch.setattr(oflow.time, "monotonic", lambda: 7.0, raising=True)
     out = f.loaded_tokens()
     assert (
         out is tokens
         and f.access_token == "A"
         and f.refresh_token == "R"
-        and f._token_expires_at == 1000.0
+        and f._token_expires_at == 7.0
     )
 
 
@@ -63,13 +66,13 @@ def test_return_tokens_error_paths(monkeypatch):
 
 
 def test_get_port_invalid(monkeypatch):
-    # Подменяем EnvironmentVariables внутри модуля на заглушку
+    # Подменяем общий экземпляр EnvironmentVariables внутри модуля на заглушку
     import src.YADISK.OAUTH.oauthflow as of
 
     class V:
         def get_var(self, name, default=""):
             return "http://localhost"  # без порта
 
-    monkeypatch.setattr(of, "EnvironmentVariables", lambda: V(), raising=True)
+    monkeypatch.setattr(of, "env", lambda: V(), raising=True)
     with pytest.raises(ValueError):
-        of.OAuthFlow.get_port()
+        of.OAuthFlow().get_port()
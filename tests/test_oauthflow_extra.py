@@ -50,7 +50,7 @@ def test_exchange_token_success(monkeypatch):
 
         text = ""
 
-    monkeypatch.setattr(requests, "post", lambda *a, **k: R(), raising=True)
+    monkeypatch.setattr(oflow.SESSION, "post", lambda *a, **k: R(), raising=True)
 
     # Должно завершиться без исключений при успешном статусе.
     f.exchange_token("CODE", "verifier")
@@ -71,7 +71,7 @@ def test_exchange_token_error(monkeypatch):
         def raise_for_status(self):
             raise requests.HTTPError("bad")
 
-    monkeypatch.setattr(requests, "post", lambda *a, **k: R(), raising=True)
+    monkeypatch.setattr(oflow.SESSION, "post", lambda *a, **k: R(), raising=True)
     with pytest.raises(Exception):
         f.exchange_token("CODE", "verifier")
 
@@ -95,3 +95,126 @@ def test_updated_tokens_without_network(monkeypatch):
     assert tokens["expires_in"] == "60"
     assert tokens["access_token"] == "A"
     assert saved == {"acc": "A", "ref": "R", "exp": "9999"}
+
+
+def test_wait_for_callback_event(monkeypatch):
+    f = OAuthFlow()
+    f.callback_event.set()
+    f.wait_for_callback()  # событие уже произошло — возврат без ожидания
+
+    monkeypatch.setattr(oflow, "CALLBACK_TIMEOUT_SECONDS", 0.01, raising=True)
+    f2 = OAuthFlow()
+    with pytest.raises(TimeoutError):
+        f2.wait_for_callback()
+
+
+def test_create_expires_at_uses_monotonic_for_memory(monkeypatch):
+    f = OAuthFlow()
+    monkeypatch.setattr(oflow.time, "time", lambda: 1000.0, raising=True)
+    monkeypatch.setattr(oflow.time, "monotonic", lambda: 5.0, raising=True)
+    exp = f.create_expires_at({"expires_in": "120"})
+    assert float(exp) == 1060.0  # keyring: системные часы
+    assert f._token_expires_at == 65.0  # память: monotonic
+
+
+def test_full_auth_flow_stops_server(monkeypatch):
+    f = OAuthFlow()
+    events = []
+
+    class FakeServer:
+        def shutdown(self):
+            events.append("shutdown")
+
+        def server_close(self):
+            events.append("close")
+
+    monkeypatch.setattr(f, "build_auth_url", lambda challenge: "http://auth")
+    monkeypatch.setattr(f, "start_auth_server", lambda: FakeServer())
+    monkeypatch.setattr(f, "wait_for_callback", lambda: events.append("callback"))
+    monkeypatch.setattr(f, "parse_callback", lambda: "CODE")
+    monkeypatch.setattr(f, "exchange_token", lambda code, verifier: "TOKEN")
+
+    assert f.full_auth_flow() == "TOKEN"
+    assert events == ["callback", "shutdown", "close"]
+
+
+def test_full_auth_flow_forgets_previous_callback(monkeypatch):
+    f = OAuthFlow()
+    f.callback_event.set()  # остался от прошлой аутентификации
+    f.callback_path = "/cb?code=OLD"
+    seen = {}
+
+    class FakeServer:
+        def shutdown(self):
+            pass
+
+        def server_close(self):
+            pass
+
+    def wait_for_callback():
+        seen["event"] = f.callback_event.is_set()
+        seen["path"] = f.callback_path
+        f.callback_path = "/cb?code=NEW"
+
+    monkeypatch.setattr(f, "build_auth_url", lambda challenge: "http://auth")
+    monkeypatch.setattr(f, "start_auth_server", lambda: FakeServer())
+    monkeypatch.setattr(f, "open_browser", lambda url: None)
+    monkeypatch.setattr(f, "wait_for_callback", wait_for_callback)
+    monkeypatch.setattr(f, "exchange_token", lambda code, verifier: code)
+
+    assert f.full_auth_flow() == "NEW"
+    assert seen == {"event": False, "path": None}
+
+
+def test_parse_callback_variants():
+    f = OAuthFlow()
+    f.callback_path = "/cb?code=abc&state=1"
+    assert f.parse_callback() == "abc"
+
+    f.callback_path = "/cb?error=access_denied&error_description=no"
+    with pytest.raises(oflow.AuthError, match="access_denied - no"):
+        f.parse_callback()
+
+    f.callback_path = "/cb?code="
+    with pytest.raises(oflow.AuthError):
+        f.parse_callback()
+
+
+def test_callback_handler_sends_success_page_with_length():
+    import io
+
+    flow = OAuthFlow()
+    headers = {}
+    handler = types.SimpleNamespace(
+        server=types.SimpleNamespace(oauth_flow=flow),
+        path="/callback?code=abc",
+        wfile=io.BytesIO(),
+        send_response=lambda code: headers.setdefault("status", code),
+        send_header=lambda k, v: headers.__setitem__(k, v),
+        end_headers=lambda: None,
+    )
+
+    oflow.CallbackHandler.do_GET(handler)  # type: ignore[arg-type]
+
+    assert headers["status"] == 200
+    assert headers["Content-Length"] == str(len(oflow._SUCCESS_HTML_BYTES))
+    assert handler.wfile.getvalue() == oflow._SUCCESS_HTML_BYTES
+    assert flow.callback_event.is_set()
+    assert flow.callback_path == "/callback?code=abc"
+
+
+def test_start_auth_server_binds_loopback(monkeypatch):
+    bound = {}
+
+    class FakeServer:
+        def __init__(self, address, handler, flow):
+            bound["address"] = address
+
+        def serve_forever(self):
+            pass
+
+    monkeypatch.setattr(oflow, "OAuthHTTPServer", FakeServer)
+    f = OAuthFlow()
+    f.redirect_uri = "http://localhost:8123/cb"
+    f.start_auth_server()
+    assert bound["address"] == ("127.0.0.1", 8123)
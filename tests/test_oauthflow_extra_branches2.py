@@ -42,7 +42,7 @@ def test_get_tokens_from_url_status_400(monkeypatch):
         status_code = 400
         text = "bad"
 
-    monkeypatch.setattr(oflow.requests, "post", lambda *a, **k: R(), raising=True)
+    monkeypatch.setattr(oflow.SESSION, "post", lambda *a, **k: R(), raising=True)
     assert f.get_tokens_from_url() is None
 
 
@@ -58,7 +58,7 @@ def test_accept_ignores_none_and_non_matching_names():
     r.accept_remote_directory_element("archive_2025_08_17_bad.7z")
     r.accept_remote_directory_element("other_2025_08_17_1.7z")
 
-    assert r.file_nums == []
+    assert r.max_file_num == 0
     assert r._extract_file_num("archive_2025_08_17_1.zip") is None
 
 
@@ -68,7 +68,7 @@ def test_accept_is_case_insensitive_for_matching_archive_name():
 
     r.accept_remote_directory_element("ARCHIVE_2025_08_17_42.7Z")
 
-    assert r.file_nums == [42]
+    assert r.max_file_num == 42
 
 
 @freeze_time("2025-08-17")
@@ -83,3 +83,32 @@ def test_extract_file_num_escapes_custom_prefix_and_suffix(monkeypatch):
 
     assert r._extract_file_num("arch.ve+_2025_08_17_12.tar.gz") == 12
     assert r._extract_file_num("archXve+_2025_08_17_12.tar.gz") is None
+
+
+@freeze_time("2025-08-17")
+def test_max_file_num_over_directory():
+    r = RemoteArchiveNaming()
+
+    for n in (2, 7, 3):
+        r.accept_remote_directory_element(f"archive_2025_08_17_{n}.7z")
+
+    assert r.max_file_num == 7
+
+
+@freeze_time("2025-08-17")
+def test_extract_file_num_rejects_partial_matches():
+    r = RemoteArchiveNaming()
+
+    assert r._extract_file_num("archive_2025_08_17_.7z") is None
+    assert r._extract_file_num("archive_2025_08_17_1.7z.bak") is None
+    assert r._extract_file_num("archive_2025_08_17_1_2.7z") is None
+    assert r._extract_file_num("archive_2025_08_17_007.7z") == 7
+
+
+@freeze_time("2025-08-17")
+def test_archive_name_parts_shared_between_instances():
+    naming_mod._archive_name_parts.cache_clear()
+    first, second = RemoteArchiveNaming(), RemoteArchiveNaming()
+
+    assert first.archive_name_format == second.archive_name_format
+    assert naming_mod._archive_name_parts.cache_info().hits == 1
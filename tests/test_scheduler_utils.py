@@ -0,0 +1,84 @@
+import pytest
+from PyQt6.QtWidgets import QCheckBox, QHBoxLayout, QWidget
+
+import src.SETUP.SCHEDULER.scheduler_utils as utils
+
+
+@pytest.fixture
+def weekdays(qtbot) -> tuple[QHBoxLayout, list[QCheckBox]]:
+    host = QWidget()
+    qtbot.addWidget(host)
+    layout = QHBoxLayout(host)
+    boxes = [QCheckBox() for _ in range(utils.DAYS_IN_WEEK)]
+    for box in boxes:
+        layout.addWidget(box)
+    yield layout, boxes
+
+
+def test_weekdays_mask_sets_checkboxes(weekdays):
+    layout, boxes = weekdays
+
+    assert utils.set_widget_value(layout, "1111100") is None
+    assert [b.isChecked() for b in boxes] == [True] * 5 + [False] * 2
+
+    assert utils.set_widget_value(layout, "0b0000001") is None
+    assert [b.isChecked() for b in boxes] == [False] * 6 + [True]
+
+
+def test_weekdays_empty_and_invalid_mask(weekdays):
+    layout, boxes = weekdays
+    utils.set_widget_value(layout, "1111111")
+
+    assert utils.set_widget_value(layout, "") is None
+    assert not any(b.isChecked() for b in boxes)
+
+    err = utils.set_widget_value(layout, "12")
+    assert err is not None and "12" in err
+
+
+@pytest.mark.parametrize(
+    "color, css_color, font_weight",
+    [("green", "#2e7d32", "500"), ("red", "#c62828", "600"), ("blue", "blue", "400")],
+)
+def test_make_html(color, css_color, font_weight):
+    assert utils.make_html("a<b\nc", color) == (
+        '[html]<div style="text-align:center;">'
+        f'<span style="color:{css_color}; font-weight:{font_weight};">'
+        "a&lt;b<br>c</span></div><br>"
+    )
+
+
+def test_make_html_escapes_like_html_escape():
+    import html
+
+    text = "<a href=\"x\">'&'</a>\nnext"
+    body = utils.make_html(text, "red").split('600;">', 1)[1]
+    assert body == html.escape(text).replace("\n", "<br>") + "</span></div><br>"
+
+
+def test_parse_time_hhmm_returns_independent_copies():
+    first = utils.parse_time_hhmm("07:45")
+    first.setHMS(1, 2, 3)
+
+    second = utils.parse_time_hhmm("07:45")
+    assert (second.hour(), second.minute()) == (7, 45)
+    assert utils.parse_time_hhmm("7h45") is None
+
+
+def test_parse_int():
+    assert utils.parse_int("42") == 42
+    assert utils.parse_int("4x2") is None
+
+
+def test_set_widget_value_dispatch(qtbot):
+    from PyQt6.QtWidgets import QSpinBox, QToolButton
+
+    spin = QSpinBox()
+    qtbot.addWidget(spin)
+    assert utils.set_widget_value(spin, "5") is None
+    assert spin.value() == 5
+    assert utils.set_widget_value(spin, "five") is not None
+
+    button = QToolButton()
+    qtbot.addWidget(button)
+    assert "QToolButton" in utils.set_widget_value(button, "x")
@@ -0,0 +1,117 @@
+import pytest
+
+import src.SETUP.utils as utils
+
+
+def test_load_from_file_splits_existing_and_deleted(tmp_path, monkeypatch):
+    present = tmp_path / "present.txt"
+    present.write_text("x", encoding="utf-8")
+    missing = tmp_path / "missing.txt"
+    marks = tmp_path / "marks.txt"
+    marks.write_text(f"{present}\n{missing}\n", encoding="utf-8")
+
+    monkeypatch.setattr(
+        utils,
+        "handle_error_message",
+        lambda *a, **k: utils.ResultErrorMessage.DELETION_CHECK,
+    )
+
+    existing, deleted = utils.load_from_file(marks)
+
+    assert existing == [str(present)]
+    assert deleted == [str(missing)]
+
+
+def test_load_from_file_missing_file(tmp_path, monkeypatch):
+    calls = []
+    monkeypatch.setattr(utils, "handle_error_message", lambda *a, **k: calls.append(a))
+
+    assert utils.load_from_file(tmp_path / "absent.txt") == ([], [])
+    assert calls[0][0] == 0
+
+
+def test_load_from_file_truncates_deleted_list(tmp_path, monkeypatch):
+    marks = tmp_path / "marks.txt"
+    gone = [str(tmp_path / f"gone{i}") for i in range(utils.MAX_OUTPUT_DELETED + 5)]
+    marks.write_text("\n".join(gone), encoding="utf-8")
+
+    shown = []
+
+    def fake_handle(error_number, p=None, e=None, **k):
+        shown.append(p)
+        return utils.ResultErrorMessage.DELETION_CHECK
+
+    monkeypatch.setattr(utils, "handle_error_message", fake_handle)
+
+    _, deleted = utils.load_from_file(marks)
+
+    assert deleted == gone
+    lines = shown[0].split("\n")
+    assert len(lines) == utils.MAX_OUTPUT_DELETED
+    assert lines[-1] == "..."
+
+
+def test_save_set_to_file_creates_parent_and_sorts(tmp_path):
+    target = tmp_path / "sub" / "marks.txt"
+
+    utils.save_set_to_file({"b", "a", "c"}, str(target))
+
+    assert target.read_text(encoding="utf-8") == "a\nb\nc"
+
+
+def test_save_set_to_file_drops_duplicates(tmp_path):
+    target = tmp_path / "marks.txt"
+
+    utils.save_set_to_file(["b", "a", "b"], target)
+
+    assert target.read_text(encoding="utf-8") == "a\nb"
+
+
+def test_save_set_to_file_keeps_old_marks_on_bad_items(tmp_path):
+    target = tmp_path / "marks.txt"
+    target.write_text("a\nb", encoding="utf-8")
+
+    with pytest.raises(TypeError):
+        utils.save_set_to_file(["a", 1], target)
+
+    assert target.read_text(encoding="utf-8") == "a\nb"
+
+
+def test_save_set_to_file_dedupes_before_opening(tmp_path):
+    target = tmp_path / "marks.txt"
+    target.write_text("a", encoding="utf-8")
+
+    with pytest.raises(TypeError):
+        utils.save_set_to_file(["a", ["unhashable"]], target)
+
+    assert target.read_text(encoding="utf-8") == "a"
+
+
+def test_handle_error_message_logs_details_and_hides_them_from_user(monkeypatch):
+    from loguru import logger
+
+    records = []
+    sink_id = logger.add(records.append, level="ERROR", format="{message}")
+    shown = []
+    monkeypatch.setattr(utils, "handle_error", lambda msg, flags: shown.append(msg))
+    try:
+        utils.handle_error_message(3, "f.txt", PermissionError("denied"))
+    finally:
+        logger.remove(sink_id)
+
+    assert "denied" in records[0]
+    assert "f.txt" in shown[0] and "denied" not in shown[0]
+
+
+def test_format_error_msg_details():
+    template = "{p}|{e}"
+
+    assert utils._format_error_msg(template, None, None, full=True) == "|"
+    assert (
+        utils._format_error_msg(template, "f", OSError(13, "denied", "f"), full=True)
+        == "f|[Errno 13] denied: 'f'"
+    )
+    assert utils._format_error_msg(template, "f", ValueError("x"), full=False) == "f|"
+
+    long_msg = utils._format_error_msg(template, "", ValueError("x" * 1000), full=True)
+    assert len(long_msg) == utils.MAX_ERROR_DETAIL_LEN + 1
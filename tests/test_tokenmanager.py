@@ -1,4 +1,5 @@
 import requests
+from src.YADISK.http_session import SESSION
 from src.YADISK.OAUTH.tokenmanager import TokenManager
 from src.YADISK.yandexconst import YandexConstants as YC
 
@@ -50,19 +51,77 @@ def test_validate_token_api_variants(monkeypatch):
     class R1:
         status_code = 200
 
-    monkeypatch.setattr(requests, "get", lambda *a, **k: R1(), raising=True)
+    monkeypatch.setattr(SESSION, "get", lambda *a, **k: R1(), raising=True)
     assert tm._validate_token_api("t") is True
 
     # 401/other
     class R2:
         status_code = 401
 
-    monkeypatch.setattr(requests, "get", lambda *a, **k: R2(), raising=True)
+    monkeypatch.setattr(SESSION, "get", lambda *a, **k: R2(), raising=True)
     assert tm._validate_token_api("t") is False
 
     # Exception
     def boom(*a, **k):
         raise requests.RequestException("x")
 
-    monkeypatch.setattr(requests, "get", boom, raising=True)
+    monkeypatch.setattr(SESSION, "get", boom, raising=True)
     assert tm._validate_token_api("t") is False
+
+
+def test_validation_result_is_cached(monkeypatch):
+    import time
+    import src.YADISK.OAUTH.tokenmanager as tm_mod
+
+    monkeypatch.setattr(tm_mod, "_VALIDATION_CACHE", {}, raising=True)
+    calls = []
+
+    def fake_validate(self, token):
+        calls.append(token)
+        return True
+
+    monkeypatch.setattr(TokenManager, "_validate_token_api", fake_validate)
+
+    tm = TokenManager()
+    tm.variables = DummyVars()
+    tm.variables.put_keyring_var(YC.YANDEX_ACCESS_TOKEN, "acc")
+    tm.variables.put_var(YC.YANDEX_EXPIRES_AT, str(time.time() + 3600))
+
+    assert tm.load_and_validate_exist_tokens() is not None
+    assert tm.load_and_validate_exist_tokens() is not None
+    assert calls == ["acc"]
+
+
+def test_validation_not_cached_near_expiry(monkeypatch):
+    import time
+    import src.YADISK.OAUTH.tokenmanager as tm_mod
+
+    monkeypatch.setattr(tm_mod, "_VALIDATION_CACHE", {}, raising=True)
+
+    TokenManager._remember_validation("soon", time.time() + 30)
+    assert TokenManager._validated_recently("soon") is False
+
+    TokenManager._remember_validation("later", time.time() + 3600)
+    assert TokenManager._validated_recently("later") is True
+
+
+def test_save_tokens_skips_unchanged_values():
+    written = []
+
+    class CountingVars(DummyVars):
+        def put_keyring_var(self, k, v):
+            written.append(k)
+            super().put_keyring_var(k, v)
+
+    tm = TokenManager()
+    tm.variables = CountingVars()
+    tm.save_tokens("acc", "ref", "1")
+    tm.save_tokens("acc2", "ref", "2")
+
+    assert written == [
+        YC.YANDEX_ACCESS_TOKEN,
+        YC.YANDEX_EXPIRES_AT,
+        YC.YANDEX_REFRESH_TOKEN,
+        YC.YANDEX_ACCESS_TOKEN,
+        YC.YANDEX_EXPIRES_AT,
+    ]
@@ -27,3 +27,23 @@ def test_verify_integrity_mismatch(tmp_path):
     up = _mk("deadbeef")
     with pytest.raises(HashMismatchError):
         up._verify_integrity(str(f), "/disk/file")  # type: ignore[attr-defined]
+
+
+def test_mismatch_skips_next_preflight(tmp_path, monkeypatch):
+    f = tmp_path / "c.bin"
+    f.write_bytes(b"abc")
+    up = _mk("deadbeef")
+    with pytest.raises(HashMismatchError):
+        up._verify_integrity(str(f), "/disk/file")  # type: ignore[attr-defined]
+
+    # следующая попытка не перепроверяет облако перед загрузкой
+    monkeypatch.setattr(
+        up, "_already_uploaded", lambda p: (_ for _ in ()).throw(AssertionError)
+    )
+    monkeypatch.setattr(up, "_get_upload_url", lambda: "http://upload")
+    up.ya_disk = SimpleNamespace(
+        get_meta=lambda path, fields=None: SimpleNamespace(
+            md5="900150983cd24fb0d6963f7d28e17f72"
+        )
+    )
+    up.write_file_direct(str(f))
@@ -1,4 +1,6 @@
 from types import SimpleNamespace
+from yadisk.exceptions import ForbiddenError, RequestError, TooManyRequestsError
+
 from src.YADISK.uploader_yadisk import UploaderToYaDisk
 
 
@@ -23,3 +25,409 @@ def test_md5_calc_and_remote_meta(tmp_path):
     assert up.get_remote_md5_yadisk("/p") == "def456"
     up.ya_disk = SimpleNamespace(get_meta=lambda path, fields=None: SimpleNamespace())
     assert up.get_remote_md5_yadisk("/p") is None
+
+
+def test_put_file_hashes_while_streaming(monkeypatch, tmp_path):
+    import src.YADISK.uploader_yadisk as um
+
+    f = tmp_path / "data.bin"
+    f.write_bytes(b"abc" * 10000)
+    sent = {}
+
+    def fake_put(url, data, timeout, headers=None):
+        sent["len"] = len(data)
+        sent["headers"] = headers
+        assert not hasattr(data, "read")  # иначе urllib3 читает по 16 КиБ
+        sent["body"] = b"".join(bytes(block) for block in data)
+        return SimpleNamespace(raise_for_status=lambda: None)
+
+    monkeypatch.setattr(um, "TESTING", False)
+    monkeypatch.setattr(um, "_requests_put", fake_put)
+
+    up = UploaderToYaDisk(ya_disk=SimpleNamespace(), remote_path="/disk/file")
+    with open(f, "rb") as fh:
+        md5 = up._put_file("http://upload", fh, timeout=1)
+
+    assert sent["len"] == 30000
+    assert sent["headers"]["Content-Length"] == "30000"
+    assert sent["body"] == f.read_bytes()
+    assert md5 == up.calculate_md5(str(f))
+
+
+def test_put_file_empty_file_request_is_well_formed(monkeypatch, tmp_path):
+    import hashlib
+    import requests
+    import src.YADISK.uploader_yadisk as um
+
+    f = tmp_path / "empty.bin"
+    f.write_bytes(b"")
+    prepared = {}
+
+    def fake_put(url, data, timeout, headers=None):
+        prepared["req"] = requests.Request(
+            "PUT", url, data=data, headers=headers
+        ).prepare()
+        return SimpleNamespace(raise_for_status=lambda: None)
+
+    monkeypatch.setattr(um, "TESTING", False)
+    monkeypatch.setattr(um, "_requests_put", fake_put)
+
+    up = UploaderToYaDisk(ya_disk=SimpleNamespace(), remote_path="/disk/empty")
+    with open(f, "rb") as fh:
+        md5 = up._put_file("http://upload", fh, timeout=1)
+
+    req = prepared["req"]
+    assert "Transfer-Encoding" not in req.headers
+    assert req.headers["Content-Length"] == "0"
+    assert not req.body
+    assert md5 == hashlib.md5(b"").hexdigest()
+
+
+def test_hashing_reader_reuses_one_buffer(tmp_path):
+    import hashlib
+    from src.YADISK.uploader_yadisk import _HashingReader
+
+    payload = bytes(range(256)) * 5
+    f = tmp_path / "data.bin"
+    f.write_bytes(payload)
+
+    with open(f, "rb") as fh:
+        reader = _HashingReader(fh, block_size=100)
+        blocks = [bytes(block) for block in reader]  # как сокет: блок до следующего
+
+    assert b"".join(blocks) == payload
+    assert len(blocks) == 13
+    assert reader.hexdigest() == hashlib.md5(payload).hexdigest()
+
+
+def test_md5_fallback_without_file_digest(monkeypatch, tmp_path):
+    import hashlib
+
+    f = tmp_path / "data.bin"
+    f.write_bytes(b"abc")
+    monkeypatch.delattr(hashlib, "file_digest", raising=False)
+    md5 = UploaderToYaDisk.calculate_md5(str(f), chunk_size=2)
+    assert md5 == "900150983cd24fb0d6963f7d28e17f72"
+
+
+def test_retry_skips_put_when_remote_matches(monkeypatch, tmp_path):
+    import src.YADISK.uploader_yadisk as um
+
+    f = tmp_path / "data.bin"
+    f.write_bytes(b"abc")
+    up = UploaderToYaDisk(
+        ya_disk=SimpleNamespace(
+            get_meta=lambda path, fields=None: {
+                "md5": "900150983CD24FB0D6963F7D28E17F72"
+            }
+        ),
+        remote_path="/disk/file",
+    )
+    monkeypatch.setattr(up._upload_once.retry, "sleep", lambda s: None)
+    urls = []
+    monkeypatch.setattr(
+        up, "_get_upload_url", lambda: urls.append(1) or "http://upload"
+    )
+
+    def put_lost_response(url, data, timeout, headers=None):
+        b"".join(data)  # файл дошёл, ответ потерян
+        raise um.requests.exceptions.ConnectionError("reset")
+
+    monkeypatch.setattr(um, "TESTING", False)
+    monkeypatch.setattr(um, "_requests_put", put_lost_response)
+
+    up.write_file_direct(str(f))
+
+    assert len(urls) == 1  # вторая попытка обошлась проверкой MD5 без PUT
+
+
+def test_clean_first_attempt_call_sequence(monkeypatch, tmp_path):
+    import src.YADISK.uploader_yadisk as um
+
+    f = tmp_path / "data.bin"
+    f.write_bytes(b"abc")
+    calls = []
+
+    def get_upload_link(path, **kwargs):
+        calls.append("get_upload_link")
+        return "http://upload"
+
+    def get_meta(path, fields=None):
+        calls.append("get_meta")
+        return {"md5": "900150983cd24fb0d6963f7d28e17f72"}
+
+    def put(url, data, timeout, headers=None):
+        b"".join(data)
+        calls.append("PUT")
+        return SimpleNamespace(raise_for_status=lambda: None, headers={})
+
+    monkeypatch.setattr(um, "TESTING", False)
+    monkeypatch.setattr(um, "_requests_put", put)
+    up = UploaderToYaDisk(
+        ya_disk=SimpleNamespace(get_upload_link=get_upload_link, get_meta=get_meta),
+        remote_path="/disk/file",
+    )
+
+    up.write_file_direct(str(f))
+
+    assert calls == ["get_upload_link", "PUT", "get_meta"]
+
+
+def test_already_uploaded_when_remote_missing(tmp_path):
+    import src.YADISK.uploader_yadisk as um
+
+    def missing(path, fields=None):
+        raise um.YaDiskError("not found")
+
+    up = UploaderToYaDisk(
+        ya_disk=SimpleNamespace(get_meta=missing), remote_path="/disk/file"
+    )
+    assert up._already_uploaded(str(tmp_path / "absent.bin")) is False
+
+
+def test_write_file_direct_opens_file_once_across_retries(monkeypatch, tmp_path):
+    import src.YADISK.uploader_yadisk as um
+
+    f = tmp_path / "data.bin"
+    f.write_bytes(b"abc")
+    up = UploaderToYaDisk(ya_disk=SimpleNamespace(), remote_path="/disk/file")
+    monkeypatch.setattr(up._upload_once.retry, "sleep", lambda s: None)
+    monkeypatch.setattr(up, "_already_uploaded", lambda p: False)
+    monkeypatch.setattr(up, "_get_upload_url", lambda: "http://upload")
+
+    opened = []
+    real_open = up._open_local_file
+
+    def counting_open(path):
+        opened.append(path)
+        return real_open(path)
+
+    monkeypatch.setattr(up, "_open_local_file", counting_open)
+
+    bodies = []
+
+    def flaky_put(url, data, timeout, headers=None):
+        bodies.append(b"".join(bytes(block) for block in data))
+        if len(bodies) == 1:
+            raise um.requests.exceptions.ConnectionError("boom")
+        return SimpleNamespace(raise_for_status=lambda: None)
+
+    monkeypatch.setattr(um, "TESTING", False)
+    monkeypatch.setattr(um, "_requests_put", flaky_put)
+    monkeypatch.setattr(up, "_verify_integrity", lambda **k: None)
+
+    up.write_file_direct(str(f))
+
+    assert opened == [str(f)]
+    assert bodies == [b"abc", b"abc"]
+
+
+def _retry_uploader(monkeypatch, tmp_path):
+    f = tmp_path / "data.bin"
+    f.write_bytes(b"abc")
+    up = UploaderToYaDisk(ya_disk=SimpleNamespace(), remote_path="/disk/file")
+    monkeypatch.setattr(up._upload_once.retry, "sleep", lambda s: None)
+    monkeypatch.setattr(up, "_already_uploaded", lambda p: False)
+    urls = iter(["http://u1", "http://u2"])
+    fetched = []
+    monkeypatch.setattr(up, "_get_upload_url", lambda: fetched.append(1) or next(urls))
+    return up, f, fetched
+
+
+def test_upload_url_reused_after_hash_mismatch(monkeypatch, tmp_path):
+    import src.YADISK.uploader_yadisk as um
+
+    up, f, fetched = _retry_uploader(monkeypatch, tmp_path)
+    used = []
+    monkeypatch.setattr(
+        up, "_put_file", lambda upload_url, f, timeout: used.append(upload_url)
+    )
+    results = iter([um.HashMismatchError(), None])
+
+    def verify(**k):
+        err = next(results)
+        if err:
+            up._known_mismatch = True
+            raise err
+
+    monkeypatch.setattr(up, "_verify_integrity", verify)
+    up.write_file_direct(str(f))
+
+    assert used == ["http://u1", "http://u1"]
+    assert len(fetched) == 1
+    assert up._upload_url is None
+
+
+def test_stale_upload_url_replaced_within_attempt(monkeypatch, tmp_path):
+    import time
+    import requests
+
+    up, f, fetched = _retry_uploader(monkeypatch, tmp_path)
+    up._upload_url, up._known_mismatch = "http://old", True
+    up._upload_url_at = time.monotonic()
+    used = []
+
+    def put(upload_url, f, timeout):
+        used.append(upload_url)
+        if upload_url == "http://old":
+            raise requests.exceptions.HTTPError(
+                response=SimpleNamespace(status_code=410)
+            )
+
+    monkeypatch.setattr(up, "_put_file", put)
+    monkeypatch.setattr(up, "_verify_integrity", lambda **k: None)
+    up.write_file_direct(str(f))
+
+    assert used == ["http://old", "http://u1"]
+
+
+def test_retry_policy_by_exception_type(monkeypatch, tmp_path):
+    import pytest
+    import requests
+
+    def http_error(code):
+        return requests.exceptions.HTTPError(response=SimpleNamespace(status_code=code))
+
+    cases = [
+        (requests.exceptions.ReadTimeout(), 5),
+        (requests.exceptions.ConnectionError(), 5),
+        (http_error(503), 5),
+        (requests.exceptions.SSLError(), 1),
+        (requests.exceptions.InvalidURL(), 1),
+        (http_error(400), 1),
+    ]
+    for exc, expected_calls in cases:
+        up, f, _ = _retry_uploader(monkeypatch, tmp_path)
+        monkeypatch.setattr(up, "_get_upload_url", lambda: "http://u")
+        calls = []
+
+        def put(upload_url, f, timeout, exc=exc):
+            calls.append(1)
+            raise exc
+
+        monkeypatch.setattr(up, "_put_file", put)
+        with pytest.raises(type(exc)):
+            up.write_file_direct(str(f))
+        assert len(calls) == expected_calls, exc
+
+
+def test_verify_uses_put_etag_before_get_meta(monkeypatch, tmp_path):
+    import pytest
+    import src.YADISK.uploader_yadisk as um
+
+    f = tmp_path / "data.bin"
+    f.write_bytes(b"abc")
+    md5 = "900150983cd24fb0d6963f7d28e17f72"
+    meta_calls = []
+    up = UploaderToYaDisk(
+        ya_disk=SimpleNamespace(
+            get_meta=lambda path, fields=None: meta_calls.append(path) or {"md5": md5}
+        ),
+        remote_path="/disk/file",
+    )
+    monkeypatch.setattr(um, "TESTING", False)
+
+    def put(url, data, timeout, headers=None):
+        b"".join(data)
+        return SimpleNamespace(
+            raise_for_status=lambda: None, headers={"Etag": f'"{md5.upper()}"'}
+        )
+
+    monkeypatch.setattr(um, "_requests_put", put)
+    with open(f, "rb") as fh:
+        local_md5 = up._put_file("http://upload", fh, timeout=1)
+    up._verify_integrity(str(f), "/disk/file", local_md5=local_md5)
+    assert meta_calls == []
+
+    # ETag не совпал — проверяем по метаданным, а не объявляем расхождение
+    up._put_etag = "0" * 32
+    up._verify_integrity(str(f), "/disk/file", local_md5=local_md5)
+    assert meta_calls == ["/disk/file"]
+
+    assert UploaderToYaDisk._etag_md5(SimpleNamespace(headers={"Etag": "xyz"})) is None
+    with pytest.raises(um.HashMismatchError):
+        up._put_etag = None
+        up._verify_integrity(str(f), "/disk/file", local_md5="f" * 32)
+
+
+def _failing_link_attempts(monkeypatch, tmp_path, exc):
+    import pytest
+
+    f = tmp_path / "data.bin"
+    f.write_bytes(b"abc")
+    calls = []
+
+    def link(path, **kwargs):
+        calls.append(path)
+        raise exc
+
+    up = UploaderToYaDisk(
+        ya_disk=SimpleNamespace(get_upload_link=link), remote_path="/disk/file"
+    )
+    monkeypatch.setattr(up._upload_once.retry, "sleep", lambda s: None)
+    with pytest.raises(type(exc)) as info:
+        up.write_file_direct(str(f))
+    assert info.value is exc  # ошибка API не оборачивается
+    return len(calls)
+
+
+def test_upload_link_429_is_retried(monkeypatch, tmp_path):
+    assert _failing_link_attempts(monkeypatch, tmp_path, TooManyRequestsError()) == 5
+
+
+def test_upload_link_403_is_not_retried(monkeypatch, tmp_path):
+    assert _failing_link_attempts(monkeypatch, tmp_path, ForbiddenError()) == 1
+
+
+def test_upload_uses_connect_and_read_timeouts(monkeypatch, tmp_path):
+    import src.YADISK.uploader_yadisk as um
+
+    f = tmp_path / "data.bin"
+    f.write_bytes(b"abc")
+    seen = {}
+
+    def link(path, **kwargs):
+        seen["api"] = kwargs["timeout"]
+        return "http://upload"
+
+    def put(url, data, timeout, headers=None):
+        b"".join(data)
+        seen["put"] = timeout
+        return SimpleNamespace(raise_for_status=lambda: None)
+
+    up = UploaderToYaDisk(
+        ya_disk=SimpleNamespace(get_upload_link=link), remote_path="/disk/file"
+    )
+    monkeypatch.setattr(um, "TESTING", False)
+    monkeypatch.setattr(um, "_requests_put", put)
+    monkeypatch.setattr(up, "_already_uploaded", lambda p: False)
+    monkeypatch.setattr(up, "_verify_integrity", lambda **k: None)
+
+    up.write_file_direct(str(f))
+
+    assert seen["put"] == (um.YC.CONNECT_TIME_OUT_SECONDS, um.YC.TIME_OUT_SECONDS)
+    assert seen["api"][0] == um.YC.CONNECT_TIME_OUT_SECONDS
+
+
+def test_upload_link_retried_on_429_and_network_errors(monkeypatch, tmp_path):
+    f = tmp_path / "data.bin"
+    f.write_bytes(b"abc")
+    errors = iter([TooManyRequestsError(), RequestError()])
+
+    def link(path, **kwargs):
+        err = next(errors, None)
+        if err is not None:
+            raise err
+        return "http://upload"
+
+    up = UploaderToYaDisk(
+        ya_disk=SimpleNamespace(get_upload_link=link), remote_path="/disk/file"
+    )
+    monkeypatch.setattr(up._upload_once.retry, "sleep", lambda s: None)
+    monkeypatch.setattr(up, "_already_uploaded", lambda p: False)
+    monkeypatch.setattr(up, "_put_file", lambda upload_url, f, timeout: None)
+    monkeypatch.setattr(up, "_verify_integrity", lambda **k: None)
+
+    up.write_file_direct(str(f))
+
+    assert up._upload_once.retry.statistics["attempt_number"] == 3
@@ -2,23 +2,40 @@ import src.YADISK.writefileyandexdisk as wfy
 
 
 def test_write_file_success(monkeypatch):
+    closed = []
+
     class FakeDisk:
         def __init__(self, remote_dir, call_back_obj):
             pass
 
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc_info):
+            closed.append(True)
+
         def write_file_fast(self, local_path):
             return "/disk/ok/file.7z"
 
     monkeypatch.setattr(wfy, "YandexDisk", FakeDisk, raising=True)
     out = wfy.write_file_to_yandex_disk("C:/file.7z", "/disk", call_back_obj=object())
     assert out == "/disk/ok/file.7z"
+    assert closed == [True]
 
 
 def test_write_file_failure(monkeypatch):
+    closed = []
+
     class FakeDisk:
         def __init__(self, remote_dir, call_back_obj):
             pass
 
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc_info):
+            closed.append(True)
+
         def write_file_fast(self, local_path):
             return ""
 
@@ -30,7 +30,7 @@ def test_yandex_disk_upload_creates_dir_and_saves(monkeypatch, tmp_path):
         def mkdir(self, path):
             pass
 
-        def listdir(self, path):
+        def listdir(self, path, **kwargs):
             return [
                 SimpleNamespace(name="archive_2025_08_17_1.7z"),
                 SimpleNamespace(name="archive_2025_08_17_2.7z"),
@@ -58,3 +58,73 @@ def test_yandex_disk_upload_creates_dir_and_saves(monkeypatch, tmp_path):
     assert y.remote_path.endswith("archive_2025_08_17_3.7z")
     if remote is not None:
         assert remote.endswith("archive_2025_08_17_3.7z")
+
+
+def test_get_token_reuses_oauth_flow_until_invalidated(monkeypatch):
+    import src.YADISK.yandex_disk as yd
+    import src.YADISK.OAUTH.oauthflow as oflow
+    from src.YADISK.OAUTH import tokenmanager as tm
+
+    created = []
+
+    class FakeFlow:
+        def __init__(self):
+            created.append(self)
+
+        def get_access_token(self):
+            return "TOKEN"
+
+    monkeypatch.setattr(oflow, "OAuthFlow", FakeFlow)
+    yd.get_oauth_flow.cache_clear()
+
+    assert yd.get_token() == "TOKEN"
+    assert yd.get_token() == "TOKEN"
+    assert len(created) == 1
+
+    tm._VALIDATION_CACHE["TOKEN"] = float("inf")
+    yd.invalidate_token("TOKEN")
+    assert "TOKEN" not in tm._VALIDATION_CACHE
+    yd.get_token()
+    assert len(created) == 2
+
+
+def test_yandex_disk_close_releases_client(monkeypatch):
+    closed = []
+    monkeypatch.setattr(
+        YandexDisk, "get_token_for_API", lambda self: "TOKEN", raising=True
+    )
+    monkeypatch.setattr(
+        YandexDisk,
+        "init_ya_disk",
+        lambda self, access_token: SimpleNamespace(
+            exists=lambda path: True, close=lambda: closed.append(True)
+        ),
+        raising=True,
+    )
+
+    with YandexDisk(remote_dir="/Архивы/2025_08", call_back_obj=DummyCB()) as y:
+        assert y.ya_disk.exists(y.remote_dir)
+
+    assert closed == [True]
+
+
+def test_yandex_disk_defers_token_until_first_use(monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        YandexDisk,
+        "get_token_for_API",
+        lambda self: calls.append("token") or "TOKEN",
+        raising=True,
+    )
+    monkeypatch.setattr(
+        YandexDisk,
+        "init_ya_disk",
+        lambda self, access_token: SimpleNamespace(exists=lambda path: True),
+        raising=True,
+    )
+
+    with YandexDisk(remote_dir="/Архивы/2025_08", call_back_obj=DummyCB()) as y:
+        assert calls == []
+        assert y.ya_disk is y.ya_disk
+
+    assert calls == ["token"]
@@ -27,7 +27,7 @@ def test_dir_exists_flow(monkeypatch, tmp_path):
         def mkdir(self, path):
             raise AssertionError("should not be called")
 
-        def listdir(self, path):
+        def listdir(self, path, **kwargs):
             return []
 
         def get_upload_link(self, path):
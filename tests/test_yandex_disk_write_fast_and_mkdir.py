@@ -1,3 +1,5 @@
+import pytest
+from tenacity import RetryError
 from src.YADISK.yandex_disk import YandexDisk
 import src.YADISK.yandex_disk as ymod
 
@@ -26,7 +28,7 @@ class FakeItem:
 
 
 class ClientOK:
-    def listdir(self, path):
+    def listdir(self, path, **kwargs):
         return [FakeItem("old.7z")]
 
     def exists(self, p):
@@ -37,7 +39,7 @@ class ClientOK:
 
 
 class ClientEmpty:
-    def listdir(self, path):
+    def listdir(self, path, **kwargs):
         return []
 
     def exists(self, p):
@@ -119,3 +121,132 @@ def test_mkdir_custom_creates_all(monkeypatch):
     path = y.mkdir_custom("/Архивы/2025_08/newdir")
     assert path.endswith("/Архивы/2025_08/newdir")
     assert created  # был хотя бы один mkdir
+
+
+def test_create_remote_path_requests_only_names(monkeypatch):
+    seen = {}
+
+    class Client(ClientOK):
+        def listdir(self, path, **kwargs):
+            seen.update(kwargs)
+            return super().listdir(path)
+
+    monkeypatch.setattr(
+        YandexDisk, "get_token_for_API", lambda self: "TOKEN", raising=True
+    )
+    monkeypatch.setattr(
+        YandexDisk, "init_ya_disk", lambda self, access_token: Client(), raising=True
+    )
+    y = YandexDisk(remote_dir="/Архивы/2025_08", call_back_obj=DummyCB())
+    y.create_remote_path()
+
+    assert seen["fields"] == ["name"]
+    assert seen["limit"] >= 500
+
+
+def test_create_remote_path_skips_exists_probe(monkeypatch):
+    class Client(ClientOK):
+        def exists(self, p):
+            raise AssertionError("exists() не должен вызываться")
+
+    monkeypatch.setattr(
+        YandexDisk, "get_token_for_API", lambda self: "TOKEN", raising=True
+    )
+    monkeypatch.setattr(
+        YandexDisk, "init_ya_disk", lambda self, access_token: Client(), raising=True
+    )
+    y = YandexDisk(remote_dir="/Архивы/2025_08", call_back_obj=DummyCB())
+
+    assert y.create_remote_path().endswith(".7z")
+
+
+def test_create_remote_path_creates_missing_dir(monkeypatch):
+    created = []
+
+    class Client(ClientEmpty):
+        def listdir(self, path, **kwargs):
+            raise ymod.PathNotFoundError()
+            yield  # генератор, как в yadisk: ошибка при первой итерации
+
+        def exists(self, p):
+            return p in created
+
+        def mkdir(self, p):
+            created.append(p)
+
+    monkeypatch.setattr(
+        YandexDisk, "get_token_for_API", lambda self: "TOKEN", raising=True
+    )
+    monkeypatch.setattr(
+        YandexDisk, "init_ya_disk", lambda self, access_token: Client(), raising=True
+    )
+    y = YandexDisk(remote_dir="/Архивы/2025_08", call_back_obj=DummyCB())
+    y.create_remote_path()
+
+    assert created == ["/Архивы", "/Архивы/2025_08"]
+
+
+def test_mkdir_custom_remembers_existing_dirs(monkeypatch):
+    monkeypatch.setattr(YandexDisk, "__init__", _blank_init, raising=True)
+    y = YandexDisk(remote_dir="/Архивы/2025_08", call_back_obj=DummyCB())
+
+    probed = []
+
+    class Client:
+        def exists(self, p):
+            probed.append(p)
+            return p == "/Архивы"
+
+        def mkdir(self, p):
+            pass
+
+    y.ya_disk = Client()
+
+    y.mkdir_custom("/Архивы/2025_08")
+    y.mkdir_custom("/Архивы/2025_09")
+
+    assert probed == ["/Архивы", "/Архивы/2025_08", "/Архивы/2025_09"]
+
+
+def test_failed_mkdir_forgets_cached_ancestors(monkeypatch):
+    monkeypatch.setattr(YandexDisk, "__init__", _blank_init, raising=True)
+    y = YandexDisk(remote_dir="/Архивы/2025_08", call_back_obj=DummyCB())
+    monkeypatch.setattr(YandexDisk.mkdir_custom.retry, "sleep", lambda s: None)
+    ymod._KNOWN_REMOTE_DIRS.update({"/Архивы", "/Архивы/2025_08", "/Другое"})
+
+    class Client:
+        def exists(self, p):
+            return False
+
+        def mkdir(self, p):
+            raise RuntimeError("parent deleted")
+
+    y.ya_disk = Client()
+
+    with pytest.raises(RetryError):
+        y.mkdir_custom("/Архивы/2025_08/new/")
+
+    assert ymod._KNOWN_REMOTE_DIRS == {"/Другое"}
+
+
+def test_missing_listing_forgets_dir_and_ancestors(monkeypatch):
+    class Client(ClientEmpty):
+        def listdir(self, path, **kwargs):
+            raise ymod.PathNotFoundError()
+            yield
+
+        def exists(self, p):
+            return True
+
+    monkeypatch.setattr(
+        YandexDisk, "get_token_for_API", lambda self: "TOKEN", raising=True
+    )
+    monkeypatch.setattr(
+        YandexDisk, "init_ya_disk", lambda self, access_token: Client(), raising=True
+    )
+    ymod._KNOWN_REMOTE_DIRS.update({"/Архивы", "/Архивы/2025_08"})
+    y = YandexDisk(remote_dir="/Архивы/2025_08", call_back_obj=DummyCB())
+    y.create_remote_path()
+
+    # Забыты папка и её предки; папка заново проверена через exists()
+    assert ymod._KNOWN_REMOTE_DIRS == {"/Архивы/2025_08"}